@@ -0,0 +1,85 @@
+"""Offline asset bundle for the live draw.
+
+Run ``python assets.py`` once (with a network) to download canvas-confetti, the
+four celebration samples and the Inter font into ``static/``. Streamlit serves
+that folder at ``app/static/``; when every file is present the app uses it and
+never touches jsDelivr, Google Fonts or actions.google.com. Set
+``LOTTERY_ASSETS=cdn`` or ``=local`` to force a mode.
+"""
+import os
+import sys
+import urllib.request
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"   # relative, so it also resolves inside srcdoc iframes
+
+ASSETS = {
+    "confetti.browser.min.js":
+        "https://cdn.jsdelivr.net/npm/canvas-confetti@1.9.3/dist/confetti.browser.min.js",
+    "audio/drum_roll.ogg": "https://actions.google.com/sounds/v1/cartoon/drum_roll.ogg",
+    "audio/air_horn.ogg":
+        "https://actions.google.com/sounds/v1/transportation/air_horn_in_close_hall_series.ogg",
+    "audio/crash_cymbals.ogg": "https://actions.google.com/sounds/v1/cartoon/crash_layer_cymbals.ogg",
+    "audio/team_cheer.ogg": "https://actions.google.com/sounds/v1/crowds/team_cheer.ogg",
+    "fonts/inter-400.woff2":
+        "https://cdn.jsdelivr.net/npm/@fontsource/inter@5.0.18/files/inter-latin-400-normal.woff2",
+    "fonts/inter-600.woff2":
+        "https://cdn.jsdelivr.net/npm/@fontsource/inter@5.0.18/files/inter-latin-600-normal.woff2",
+    "fonts/inter-700.woff2":
+        "https://cdn.jsdelivr.net/npm/@fontsource/inter@5.0.18/files/inter-latin-700-normal.woff2",
+}
+SOUNDS = {
+    "roll": "audio/drum_roll.ogg",
+    "horn": "audio/air_horn.ogg",
+    "crash": "audio/crash_cymbals.ogg",
+    "cheer": "audio/team_cheer.ogg",
+}
+GOOGLE_FONTS_CSS = "@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');"
+
+
+def local_bundle_ready(static_dir=STATIC_DIR):
+    return all(os.path.isfile(os.path.join(static_dir, name)) for name in ASSETS)
+
+
+def use_local(static_dir=STATIC_DIR):
+    mode = os.environ.get("LOTTERY_ASSETS", "auto").lower()
+    if mode in ("local", "cdn"):
+        return mode == "local"
+    return local_bundle_ready(static_dir)
+
+
+def asset_url(name, local):
+    return f"{STATIC_URL}/{name}" if local else ASSETS[name]
+
+
+def sound_urls(local):
+    return {key: asset_url(name, local) for key, name in SOUNDS.items()}
+
+
+def font_css(local):
+    """Inter from the bundle (``@font-face``) or Google Fonts (``@import``)."""
+    if not local:
+        return GOOGLE_FONTS_CSS
+    return "".join(
+        f"@font-face {{ font-family: 'Inter'; font-style: normal; font-weight: {w}; "
+        f"font-display: swap; src: url('{STATIC_URL}/fonts/inter-{w}.woff2') format('woff2'); }}\n"
+        for w in (400, 600, 700)
+    )
+
+
+def fetch(static_dir=STATIC_DIR, force=False):
+    for name, url in ASSETS.items():
+        path = os.path.join(static_dir, name)
+        if os.path.isfile(path) and not force:
+            print(f"ok       {name}")
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+        with urllib.request.urlopen(req, timeout=30) as resp, open(path + ".part", "wb") as out:
+            out.write(resp.read())
+        os.replace(path + ".part", path)
+        print(f"fetched  {name}")
+
+
+if __name__ == "__main__":
+    fetch(force="--force" in sys.argv[1:])
@@ -0,0 +1,179 @@
+"""Throughput benchmarks for the lottery hot paths.
+
+Times the ``lottery`` calls the two pages make, headlessly (no Streamlit
+runtime): the simulator's odds and its batched draws streamed into a
+``PickTally``, and the live draw's ball counts, ball assignment and journaled
+draws. Covers league sizes 12/16/32/64 (half the league in the lottery) and
+ball pools of 200 to 20,000.
+
+    python benchmarks/bench_lottery.py                  # run and compare with the baseline
+    python benchmarks/bench_lottery.py --save-baseline  # record this machine's baseline
+    python benchmarks/bench_lottery.py --quick --only draw
+
+Exits non-zero when a case fails, when a baseline case did not run, or when
+any case falls more than ``--threshold`` below baseline.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)   # appended, so the root streamlit.py never shadows the real package
+
+from lottery import DrawJournal, LotteryState, exp_probs, initial_counts  # noqa: E402
+from lottery.montecarlo import PickTally, order_batches  # noqa: E402
+from lottery.rng import stream  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+# draws pay for the fsync'd journal append, as they do in the app
+JOURNAL = DrawJournal(os.path.join(tempfile.mkdtemp(prefix="bench-journal-"), "draw.jsonl"))
+LEAGUE_SIZES = (12, 16, 32, 64)
+POOL_SIZES = (200, 2_000, 20_000)
+
+
+def simulator_run(odds, sims, seed=0):
+    """The simulator page's run: batches of draws streamed into a running tally."""
+    tally = PickTally(len(odds))
+    for orders in order_batches(odds, sims, stream(seed, "simulator")):
+        tally.add(orders)
+    return tally
+
+
+def cases(quick):
+    """(name, params, setup, op) tuples; ``setup`` runs untimed before every ``op``."""
+    for league in LEAGUE_SIZES:
+        n = league // 2
+        names = [f"Team {i + 1}" for i in range(n)]
+        yield ("exp_probs", {"league": league}, None, lambda n=n: exp_probs(1.5, n))
+        odds = exp_probs(1.5, n)
+        sims = 1_000 if quick else 10_000
+        yield ("pick_tally", {"league": league, "sims": sims}, None,
+               lambda o=odds, s=sims: simulator_run(o, s))
+        for pool in POOL_SIZES:
+            params = {"league": league, "pool": pool}
+            # the consolation winner (2nd worst) gets its +1 ball, as on draft night
+            yield ("initial_counts", params, None, lambda o=odds, p=pool: initial_counts(o, p, 1))
+            counts = initial_counts(odds, pool, 1)
+
+            def assign(names=names, counts=counts):
+                state = LotteryState(names, counts)
+                JOURNAL.start(state)
+                return state
+
+            yield ("assign_balls", params, None, assign)
+
+            live = {}
+
+            def fresh_draw(live=live, assign=assign, rng=np.random.default_rng(0)):
+                # a new lottery whenever the previous one finished; draws hit random balls
+                if "state" not in live or live["state"].complete:
+                    live["state"] = assign()
+                live["ball"] = int(rng.integers(1, live["state"].total_balls + 1))
+
+            yield ("draw_ball", params, fresh_draw, lambda live=live: JOURNAL.draw(live["state"], live["ball"]))
+
+
+def measure(setup, op, min_time, max_calls=200_000, memory_calls=20):
+    latencies = []
+    deadline = time.perf_counter() + min_time
+    while time.perf_counter() < deadline and len(latencies) < max_calls:
+        if setup:
+            setup()
+        start = time.perf_counter_ns()
+        op()
+        latencies.append(time.perf_counter_ns() - start)
+    lat = np.array(latencies, dtype=np.float64) / 1e3
+    tracemalloc.start()
+    for _ in range(memory_calls):
+        if setup:
+            setup()
+        op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "calls": len(lat),
+        "ops_per_sec": float(1e6 / lat.mean()),
+        "p50_us": float(np.percentile(lat, 50)),
+        "p95_us": float(np.percentile(lat, 95)),
+        "p99_us": float(np.percentile(lat, 99)),
+        "peak_kib": peak / 1024,
+    }
+
+
+def case_key(name, params):
+    return name + "[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]"
+
+
+def compare(results, baseline, threshold, only=None):
+    """(regressions, missing): cases slower than ``threshold`` below baseline,
+    and baseline cases (matching ``only``) that have no result."""
+    regressions = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if base and res["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append((key, base["ops_per_sec"], res["ops_per_sec"]))
+    missing = [key for key in baseline if key not in results and (not only or only in key.split("[")[0])]
+    return regressions, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="short runs (0.05 s per case)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per case")
+    parser.add_argument("--only", help="run cases whose name contains this text")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed ops/sec drop (0.25 = 25%%)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+    min_time = 0.05 if args.quick else args.min_time
+
+    results, failed = {}, []
+    print(f"{'case':58} {'ops/s':>12} {'p50 µs':>10} {'p95 µs':>10} {'p99 µs':>10} {'peak KiB':>9}")
+    for name, params, setup, op in cases(args.quick):
+        if args.only and args.only not in name:
+            continue
+        key = case_key(name, params)
+        try:
+            res = measure(setup, op, min_time)
+        except Exception as e:
+            print(f"{key:58} failed: {e}")
+            failed.append(key)
+            continue
+        results[key] = res
+        print(f"{key:58} {res['ops_per_sec']:12,.0f} {res['p50_us']:10.1f} {res['p95_us']:10.1f} "
+              f"{res['p99_us']:10.1f} {res['peak_kib']:9.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if failed:
+        print(f"{len(failed)} case(s) failed; no baseline comparison.")
+        return 1
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --save-baseline to record one.")
+        return 0
+    with open(args.baseline) as f:
+        regressions, missing = compare(results, json.load(f), args.threshold, args.only)
+    for key, before, after in regressions:
+        print(f"REGRESSION {key}: {before:,.0f} -> {after:,.0f} ops/s")
+    for key in missing:
+        print(f"MISSING {key}: in the baseline but not run")
+    if not regressions and not missing:
+        print(f"No regressions beyond {args.threshold:.0%} of baseline.")
+    return 1 if regressions or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+// Web Audio engine shared by the audio preloader iframe and the celebration
+// component. Expects SOUND_URLS (key -> url) in scope; buffers live on
+// window.parent so every frame in the tab replays the same decoded samples.
+var HOST = window.parent;
+var AUDIO = HOST.__dynastyAudio || (HOST.__dynastyAudio = { ctx: null, buffers: {}, loading: {} });
+if (!AUDIO.ctx) {
+    try { AUDIO.ctx = new (HOST.AudioContext || HOST.webkitAudioContext)(); } catch (_) {}
+}
+function loadSounds() {
+    if (!AUDIO.ctx) return;
+    Object.keys(SOUND_URLS).forEach(function(key) {
+        if (AUDIO.buffers[key] || Date.now() - (AUDIO.loading[key] || 0) < 10000) return;
+        AUDIO.loading[key] = Date.now();
+        HOST.fetch(SOUND_URLS[key])
+            .then(function(r) { return r.arrayBuffer(); })
+            .then(function(data) {
+                return new Promise(function(ok, fail) { AUDIO.ctx.decodeAudioData(data, ok, fail); });
+            })
+            .then(function(buf) { AUDIO.buffers[key] = buf; })
+            .catch(function() { AUDIO.loading[key] = 0; });
+    });
+}
+function playSound(key, volume, stopAfterMs) {
+    try {
+        var buf = AUDIO.buffers[key];
+        if (buf && AUDIO.ctx) {
+            if (AUDIO.ctx.state === 'suspended') AUDIO.ctx.resume();
+            var src = AUDIO.ctx.createBufferSource();
+            var gain = AUDIO.ctx.createGain();
+            gain.gain.value = volume;
+            src.buffer = buf;
+            src.connect(gain);
+            gain.connect(AUDIO.ctx.destination);
+            src.start();
+            if (stopAfterMs) setTimeout(function() { try { src.stop(); } catch (_) {} }, stopAfterMs);
+            return;
+        }
+        var el = new Audio(SOUND_URLS[key]);
+        el.volume = volume;
+        el.play().catch(function() {});
+        if (stopAfterMs) setTimeout(function() { try { el.pause(); el.currentTime = 0; } catch (_) {} }, stopAfterMs);
+    } catch (_) {}
+}
@@ -0,0 +1,2 @@
+"""Marks the repository root for pytest, which puts it on ``sys.path`` so the
+tests import ``lottery`` from a plain ``pytest`` run, not only ``python -m pytest``."""
@@ -0,0 +1,53 @@
+"""Headless Dynasty draft lottery core (no Streamlit imports)."""
+from .apportion import METHODS, COMMON_POOL_SIZES, apportion, pool_tables
+from .broadcast import get_channel
+from .exact import pick_probabilities, pick_probabilities_batch, proportional_probabilities
+from .formats import LEAGUE_FORMATS, DEFAULT_FORMAT, EXACT_MAX_TEAMS, get_format
+from .journal import DrawJournal, StaleDraw
+from .leagues import DEFAULT_LEAGUE, list_leagues, resolve_league
+from .montecarlo import draw_orders, pick_histogram, simulate_orders, order_batches, PickTally
+from .optimize import parse_target, candidates, optimize
+from .parallel import simulate_histogram
+from .profiling import NULL_TRACER, RerunTracer
+from .replay import replay_orders, replay_histogram, rounding_report, pick_odds, compare_methods
+from .rng import new_seed, stream, spawn
+from .rules import TOTAL_BALLS, INITIAL_PROBS, initial_counts, redistribute, after_draw, exp_probs
+from .sensitivity import ball_sensitivity, largest_change
+from .speculate import precompute, branch_result, cancel as cancel_branches
+from .standings import StandingsCatalog, get_catalog, load_standings
+from .state import LotteryState, assign_owners
+from .trades import parse_trade, apply_trade, transfer_sweep, evaluate_trades
+
+# History is built on pandas; load it on first use so headless tools
+# (``python -m lottery``) start without paying for the pandas import.
+_LAZY = {"season_table": "history", "what_if": "history"}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+        return getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "METHODS", "COMMON_POOL_SIZES", "apportion", "pool_tables",
+    "get_channel",
+    "pick_probabilities", "pick_probabilities_batch", "proportional_probabilities",
+    "LEAGUE_FORMATS", "DEFAULT_FORMAT", "EXACT_MAX_TEAMS", "get_format",
+    "DrawJournal", "StaleDraw",
+    "DEFAULT_LEAGUE", "list_leagues", "resolve_league",
+    "draw_orders", "pick_histogram", "simulate_orders", "order_batches", "PickTally",
+    "parse_target", "candidates", "optimize",
+    "simulate_histogram",
+    "NULL_TRACER", "RerunTracer",
+    "replay_orders", "replay_histogram", "rounding_report", "pick_odds", "compare_methods",
+    "new_seed", "stream", "spawn",
+    "TOTAL_BALLS", "INITIAL_PROBS", "initial_counts", "redistribute", "after_draw", "exp_probs",
+    "ball_sensitivity", "largest_change",
+    "precompute", "branch_result", "cancel_branches",
+    "StandingsCatalog", "get_catalog", "load_standings",
+    "LotteryState", "assign_owners",
+    "parse_trade", "apply_trade", "transfer_sweep", "evaluate_trades",
+    "season_table", "what_if",
+]
@@ -0,0 +1,6 @@
+"""``python -m lottery``: see ``lottery.cli``."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
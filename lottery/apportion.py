@@ -0,0 +1,129 @@
+"""Whole-ball apportionment: split ``total`` balls in proportion to weights.
+
+The lottery apportions twice: the starting pool (weights = the odds table) and
+every draw (weights = the remaining teams' balls, total = the winner's balls).
+Methods, all vectorized over a batch of rows:
+
+``current``            ``round()`` each share, then patch the surplus or shortfall
+                       one ball at a time round-robin from the largest share down
+                       (the live app's draw rule; its starting pool instead dumps
+                       the residue on the worst team, see ``rules.initial_counts``)
+``largest_remainder``  Hamilton: floor every share, leftovers to the largest remainders
+                       (exact integer remainders when the weights are integers)
+``webster``            Sainte-Laguë divisor method (shares rounded at .5)
+``dhondt``             D'Hondt divisor method (shares rounded down; favours big holders)
+
+Ties go to the team earlier in pool order (the worse team).
+
+Starting pools for the common pool sizes are precomputed per odds table and
+method (``pool_tables``), so ``rules.initial_counts`` looks them up instead of
+apportioning again.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+METHODS = ("current", "largest_remainder", "webster", "dhondt")
+COMMON_POOL_SIZES = (100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+def _rank(key, eligible):
+    """Position of each column when a row is sorted by ``key`` descending
+    (stable, so ties keep pool order); ineligible columns rank last."""
+    order = np.argsort(-np.where(eligible, key, -np.inf), axis=1, kind="stable")
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(order.shape[1])[None, :], axis=1)
+    return rank
+
+
+def _divisor(w, seats, totals, eligible, offset):
+    # Move one ball per row per pass by the highest-averages priority
+    # w / (seats + offset) until every row sums to its total.
+    diff = totals - seats.sum(axis=1)
+    while (diff != 0).any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            add = np.where(eligible, w / (seats + offset), -np.inf)
+            drop = np.where(eligible & (seats > 0), w / (seats - 1 + offset), np.inf)
+        up, down = diff > 0, diff < 0
+        seats[up, add[up].argmax(axis=1)] += 1
+        # removals break ties toward the later (better) team, mirroring additions
+        seats[down, w.shape[1] - 1 - drop[down][:, ::-1].argmin(axis=1)] -= 1
+        diff = totals - seats.sum(axis=1)
+    return seats
+
+
+def apportion(weights, totals, method="current", eligible=None):
+    """Whole balls per team for each row of ``weights`` (S x n, or one 1-D row).
+
+    ``totals`` is one ball total per row (or a scalar). ``eligible`` (same shape
+    as ``weights``) marks who may receive balls; by default every column may,
+    which matters only to ``current``'s round-robin. Rows whose weights sum to
+    zero get nothing. Returns int64 in the shape of ``weights``.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}.")
+    raw = np.asarray(weights)
+    w = raw.astype(np.float64)
+    single = w.ndim == 1
+    w = np.atleast_2d(w)
+    totals = np.broadcast_to(np.asarray(totals, dtype=np.int64), (len(w),)).copy()
+    eligible = np.ones(w.shape, dtype=bool) if eligible is None else np.atleast_2d(np.asarray(eligible, dtype=bool))
+    wsum = w.sum(axis=1)
+    ok = wsum > 0
+    totals[~ok] = 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        props = np.where(ok[:, None], w / wsum[:, None], 0.0)
+    quota = totals[:, None] * props
+
+    if method == "current":
+        seats = np.round(quota)
+        diff = totals - seats.sum(axis=1).astype(np.int64)
+        fix = diff != 0
+        if fix.any():
+            rank = _rank(props[fix], eligible[fix])
+            q, rem = np.divmod(np.abs(diff[fix]), eligible[fix].sum(axis=1))
+            adjust = q[:, None] + (rank < rem[:, None])
+            seats[fix] += np.sign(diff[fix])[:, None] * np.where(eligible[fix], adjust, 0)
+        seats = seats.astype(np.int64)
+    elif method == "largest_remainder":
+        if np.issubdtype(raw.dtype, np.integer):
+            # w * total // sum and its remainder: float quotas can split a real tie
+            whole = np.atleast_2d(raw).astype(np.int64)
+            seats, remainder = np.divmod(whole * totals[:, None], np.maximum(whole.sum(axis=1), 1)[:, None])
+        else:
+            seats = np.floor(quota)
+            remainder = quota - seats
+        left = totals - seats.sum(axis=1).astype(np.int64)
+        seats = seats.astype(np.int64) + (_rank(remainder, eligible & (w > 0)) < left[:, None])
+    else:
+        offset = 0.5 if method == "webster" else 1.0
+        seats = np.floor(quota + (1.0 - offset)).astype(np.int64)   # a valid start for either divisor rule
+        seats = _divisor(w, seats, totals, eligible & (w > 0), offset)
+    return seats[0] if single else seats
+
+
+def starting_counts(probs, totals, method="current"):
+    """Starting pool (before any consolation boost) for each of ``totals``, one
+    row per total, worst team first.
+
+    ``current`` rounds ``total * probs[i] / 100`` and dumps the residue on the
+    worst team, as the live app does; other methods ``apportion`` the table.
+    """
+    totals = np.asarray(totals, dtype=np.int64)
+    probs = np.asarray(probs)
+    if method != "current":
+        return apportion(np.tile(probs, (len(totals), 1)), totals, method)
+    counts = np.round(totals[:, None] * probs.astype(np.float64) / 100).astype(np.int64)
+    counts[:, 0] += totals - counts.sum(axis=1)
+    return counts
+
+
+@lru_cache(maxsize=256)
+def pool_tables(probs, method="current", pool_sizes=COMMON_POOL_SIZES):
+    """{pool size: starting counts} for an odds table (a tuple) under one
+    method, every size apportioned in one batched call. Cached per table,
+    method and pool sizes."""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}.")
+    rows = starting_counts(probs, pool_sizes, method)
+    return {t: tuple(row.tolist()) for t, row in zip(pool_sizes, rows)}
@@ -0,0 +1,62 @@
+"""In-process pub/sub for spectators of a live draw.
+
+The commissioner's session publishes a small, plain-data event after every
+state change (balls assigned, ball drawn, reset). Spectator sessions only read
+the version number each poll and rerun only when it moved, so following a draw
+costs a lock and an int compare per viewer rather than a full run of the app,
+and everything they render from a new event (chips, odds) hits caches the
+commissioner already filled. Channels are
+process-wide, one per draw key.
+"""
+import threading
+import time
+
+VIEWER_WINDOW = 10.0   # seconds since a spectator's last poll for it to count as watching
+
+
+class Channel:
+    """Latest event of one draw, with a version that bumps on every publish."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.event = None
+        self._viewers = {}
+
+    def publish(self, event):
+        """Replace the current event (treat it as immutable once published)."""
+        with self._lock:
+            self.version += 1
+            self.event = event
+            return self.version
+
+    def latest(self):
+        """(version, event); version 0 means nothing was published yet."""
+        with self._lock:
+            return self.version, self.event
+
+    def touch(self, viewer):
+        """Mark ``viewer`` (any hashable, e.g. a session id) as watching."""
+        with self._lock:
+            self._viewers[viewer] = time.monotonic()
+
+    def viewers(self, window=VIEWER_WINDOW):
+        """How many viewers polled in the last ``window`` seconds."""
+        cutoff = time.monotonic() - window
+        with self._lock:
+            for viewer in [v for v, t in self._viewers.items() if t < cutoff]:
+                del self._viewers[viewer]
+            return len(self._viewers)
+
+
+_channels = {}
+_channels_lock = threading.Lock()
+
+
+def get_channel(key):
+    """The process-wide channel for ``key``, created on first use."""
+    with _channels_lock:
+        channel = _channels.get(key)
+        if channel is None:
+            channel = _channels[key] = Channel()
+        return channel
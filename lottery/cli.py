@@ -0,0 +1,423 @@
+"""Command-line batch runner: standings CSV + odds config -> pick matrices.
+
+    python -m lottery Standings/Dynasty2025.csv
+    python -m lottery Standings/Dynasty2025.csv --exp-base 1.6 --balls 1000 -o odds.json
+    python -m lottery --config overnight.json --workers 8 -o results.parquet
+    python -m lottery Standings/Dynasty2025.csv --trade "Phil -> Sherman 10" --rank-by Phil
+    python -m lottery --history Standings --exp-base 1.6 -o history.csv
+    python -m lottery --target "team1 top3 >= 90%" --sweep-exp-base 1.4,1.6,1.8 --sweep-balls 200,1000
+
+A run evaluates one config per odds table under the live whole-ball rules,
+exactly when the pool is small enough (see ``formats.EXACT_MAX_TEAMS``) and by
+seeded replay otherwise. ``--config`` takes a JSON list of configs whose keys
+are the long option names (``{"standings": ..., "exp_base": 1.6, "balls": 500}``);
+configs run in parallel across a process pool. Output goes to CSV, JSON or
+Parquet by extension (Parquet needs pandas + pyarrow), or CSV on stdout.
+
+``--trade`` (repeatable, or ``--trades`` with one trade per line) scores ball
+trades against the config's pool instead and writes them ranked, one row per
+trade and team (see ``lottery.trades``).
+
+``--history`` replays every season in a standings folder under the league
+format's own odds table and under the config's, one row per season for the team at pool
+``--position`` (see ``lottery.history``; this path needs pandas).
+
+``--target`` (repeatable) runs the odds-table optimizer instead: it sweeps the
+config's table plus every ``--sweep-exp-base`` curve across the ``--sweep-balls``
+pool sizes and ``--sweep-boost`` boosts, and writes the candidates best-first
+(see ``lottery.optimize``).
+
+Nothing else here imports Streamlit or pandas, so it starts in well under a second.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .apportion import METHODS
+from .exact import pick_probabilities
+from .formats import EXACT_MAX_TEAMS, LEAGUE_FORMATS
+from .optimize import candidates, optimize
+from .parallel import simulate_histogram
+from .rules import INITIAL_PROBS, TOTAL_BALLS, exp_probs, initial_counts
+from .standings import rank_column
+from .trades import evaluate_trades
+
+DEFAULTS = {
+    "standings": None, "lottery_teams": 6, "playoff_teams": None, "probs": None, "exp_base": None,
+    "format": None, "balls": None, "consolation": "auto", "boost": 1, "method": "current",
+    "mode": "auto", "sims": 1_000_000, "seed": 0, "name": None,
+}
+
+
+def read_standings(path):
+    """[(team, max_pf, rank)] sorted by rank, read with the csv module."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        columns = [c.strip() for c in reader.fieldnames or []]
+        reader.fieldnames = columns
+        rank_col = rank_column(columns)
+        if rank_col is None or "Team" not in columns or "MaxPF" not in columns:
+            raise ValueError(f"{path}: needs Team, MaxPF and a playoff rank column.")
+        rows = []
+        for row in reader:
+            try:
+                rows.append((row["Team"].strip(), float(row["MaxPF"]), int(float(row[rank_col]))))
+            except (TypeError, ValueError):
+                continue                                  # blank or malformed line
+    return sorted(rows, key=lambda r: r[2])
+
+
+def lottery_pool(rows, lottery_teams, playoff_teams=None, consolation="auto"):
+    """(names worst-first, consolation index or None) for a standings table.
+
+    Non-playoff teams are the ``lottery_teams`` best-ranked teams below the
+    playoff line, pooled by ascending MaxPF like the live app. ``consolation``
+    is ``auto`` (best non-playoff rank won the bracket, as in the simulator),
+    ``none`` or a team name.
+    """
+    if playoff_teams is None:
+        playoff_teams = len(rows) - lottery_teams
+    field = [r for r in rows if r[2] > playoff_teams][:lottery_teams]
+    if len(field) != lottery_teams:
+        raise ValueError(f"Standings have {len(field)} non-playoff teams, need {lottery_teams}.")
+    pool = sorted(field, key=lambda r: (r[1], r[2]))
+    names = [r[0] for r in pool]
+    if consolation in (None, "none"):
+        return names, None
+    if consolation == "auto":
+        return names, names.index(min(field, key=lambda r: r[2])[0])
+    if consolation not in names:
+        raise ValueError(f"Consolation winner {consolation!r} is not a lottery team.")
+    return names, names.index(consolation)
+
+
+def resolve_config(config):
+    """Fill defaults and turn a config into (names, counts, settings)."""
+    cfg = {**DEFAULTS, **{k.replace("-", "_"): v for k, v in config.items()}}
+    fmt = LEAGUE_FORMATS[str(cfg["format"])] if cfg["format"] is not None else None
+    if fmt is not None:
+        cfg["lottery_teams"] = fmt.teams - fmt.playoff_teams
+        cfg["playoff_teams"] = cfg["playoff_teams"] or fmt.playoff_teams
+    n = int(cfg["lottery_teams"])
+    if cfg["probs"] is not None:
+        probs = [float(p) for p in (cfg["probs"].split(",") if isinstance(cfg["probs"], str) else cfg["probs"])]
+    elif cfg["exp_base"] is not None:
+        probs = exp_probs(float(cfg["exp_base"]), n)
+    elif fmt is not None:
+        probs = list(fmt.probs)
+    elif n == len(INITIAL_PROBS):
+        probs = list(INITIAL_PROBS)
+    else:
+        raise ValueError(f"{n} lottery teams: give probs, exp_base or format.")
+    if len(probs) != n:
+        raise ValueError(f"probs has {len(probs)} entries for {n} lottery teams.")
+    balls = int(cfg["balls"] or (fmt.total_balls if fmt is not None else TOTAL_BALLS))
+    if cfg["standings"]:
+        names, consolation = lottery_pool(read_standings(cfg["standings"]), n, cfg["playoff_teams"],
+                                          cfg["consolation"])
+    else:
+        names = [f"Team {i + 1}" for i in range(n)]
+        consolation = None if cfg["consolation"] in ("auto", "none", None) else names.index(cfg["consolation"])
+    counts = initial_counts(probs, balls, consolation, int(cfg["boost"]), cfg["method"])
+    if min(counts) < 1:
+        raise ValueError(f"Every lottery team needs a ball; got {counts}.")
+    cfg.update(probs=probs, balls=balls, consolation_index=consolation)
+    return names, counts, cfg
+
+
+def evaluate(config, workers=0):
+    """One config's result: counts, the team x pick matrix and per-team stats."""
+    start = time.perf_counter()
+    names, counts, cfg = resolve_config(config)
+    mode = cfg["mode"]
+    if mode == "auto":
+        mode = "exact" if len(counts) <= EXACT_MAX_TEAMS else "montecarlo"
+    if mode == "exact":
+        matrix = np.array(pick_probabilities(counts, cfg["method"]))
+        stderr = np.zeros_like(matrix)
+    else:
+        sims = int(cfg["sims"])
+        hist = simulate_histogram(counts, sims, int(cfg["seed"]), "whole_ball", workers, method=cfg["method"])
+        matrix = hist / sims
+        stderr = np.sqrt(matrix * (1 - matrix) / sims)
+    picks = np.arange(1, len(counts) + 1)
+    return {
+        "name": cfg["name"] or os.path.basename(cfg["standings"] or "config"),
+        "standings": cfg["standings"],
+        "mode": mode,
+        "sims": int(cfg["sims"]) if mode == "montecarlo" else None,
+        "seed": int(cfg["seed"]) if mode == "montecarlo" else None,
+        "method": cfg["method"],
+        "balls": cfg["balls"],
+        "probs": cfg["probs"],
+        "teams": names,
+        "counts": counts,
+        "matrix": matrix.tolist(),
+        "stderr": stderr.tolist(),
+        "expected_pick": (matrix @ picks).tolist(),
+        "top3": matrix[:, :3].sum(axis=1).tolist(),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def run(configs, workers=None):
+    """Evaluate every config: one config spreads its replay over ``workers``
+    processes, several configs run one per process. ``workers=0`` stays in-process."""
+    if len(configs) == 1 or workers == 0:
+        return [evaluate(c, workers if len(configs) == 1 else 0) for c in configs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(evaluate, configs))
+
+
+def long_rows(results):
+    """One row per team per config: the flat shape written to CSV and Parquet."""
+    width = max(len(r["teams"]) for r in results)
+    for r in results:
+        for i, team in enumerate(r["teams"]):
+            row = {"config": r["name"], "mode": r["mode"], "method": r["method"], "balls_total": r["balls"],
+                   "team": team, "pool": i + 1, "balls": r["counts"][i],
+                   "expected_pick": r["expected_pick"][i], "top3": r["top3"][i]}
+            for k in range(width):
+                row[f"pick_{k + 1}"] = r["matrix"][i][k] if k < len(r["teams"]) else None
+            yield row
+
+
+def write_rows(rows, out, ext):
+    if ext == ".parquet":
+        import pandas as pd
+        pd.DataFrame(rows).to_parquet(out, index=False)
+    elif ext == ".csv":
+        f = open(out, "w", newline="", encoding="utf-8") if out else sys.stdout
+        try:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        finally:
+            if out:
+                f.close()
+    else:
+        raise ValueError(f"Unknown output type {ext!r}; use .csv, .json or .parquet.")
+
+
+def write(results, out):
+    ext = os.path.splitext(out)[1].lower() if out else ".csv"
+    if ext == ".json":
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
+    else:
+        write_rows(list(long_rows(results)), out, ext)
+
+
+def trade_rows(results, names):
+    """One row per team per trade, best trade first: the flat shape for CSV and Parquet."""
+    for rank, r in enumerate(results, 1):
+        for i, team in enumerate(names):
+            row = {"rank": rank, "trade": r["trade"], "exact": r["exact"], "team": team, "pool": i + 1,
+                   "balls": r["counts"][i], "expected_pick": r["expected_pick"][i], "gain": r["gain"][i]}
+            for k in range(len(names)):
+                row[f"pick_{k + 1}"] = r["matrix"][i][k]
+            yield row
+
+
+def run_trades(config, trades, rank_by=None):
+    """Score ``trades`` against one config's pool; returns (names, ranked results)."""
+    names, counts, cfg = resolve_config(config)
+    results = evaluate_trades(counts, trades, names, rank_by, cfg["method"], seed=int(cfg["seed"]))
+    if len(results) < len(trades):
+        print(f"skipped {len(trades) - len(results)} trade(s) that leave a team without a ball "
+              f"(pool {dict(zip(names, counts))})", file=sys.stderr)
+    if not results:
+        raise ValueError("No trade leaves every lottery team with a ball.")
+    return names, results
+
+
+def write_trades(names, results, out):
+    ext = os.path.splitext(out)[1].lower() if out else ".csv"
+    if ext == ".json":
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump([{"trade": r["trade"], "exact": r["exact"], "teams": names, "counts": list(r["counts"]),
+                        "matrix": r["matrix"].tolist(), "expected_pick": r["expected_pick"].tolist(),
+                        "gain": r["gain"].tolist()} for r in results], f, indent=1)
+    else:
+        write_rows(list(trade_rows(results, names)), out, ext)
+
+
+def run_history(standings_dir, config, position=1):
+    """Every season in ``standings_dir`` under the league format's own table vs
+    ``config``'s, for the team at pool ``position`` (1 = worst): the
+    ``history.compare`` frame.
+
+    The baseline is ``config``'s ``format``, or else the format with as many
+    lottery teams, each on its own pool; ``consolation`` is applied per season.
+    """
+    from .history import compare, lottery_field, season_table, what_if   # pandas: only this path needs it
+    from .standings import get_catalog
+    consolation = config.get("consolation", DEFAULTS["consolation"])
+    _, _, cfg = resolve_config({k: v for k, v in config.items() if k not in ("standings", "consolation")})
+    n = int(cfg["lottery_teams"])
+    if not 1 <= position <= n:
+        raise ValueError(f"--position must be between 1 and {n}.")
+    if cfg["format"] is not None:
+        fmt = LEAGUE_FORMATS[str(cfg["format"])]
+    else:
+        fmt = next((f for f in LEAGUE_FORMATS.values() if f.teams - f.playoff_teams == n), None)
+        if fmt is None:
+            raise ValueError(f"No league format has {n} lottery teams to compare against; give --format.")
+    field = {"playoff_teams": cfg["playoff_teams"] or fmt.playoff_teams, "lottery_teams": n,
+             "consolation": consolation}
+    table = season_table(get_catalog(standings_dir))
+    if lottery_field(table, **field).empty:
+        raise ValueError(f"No season in {standings_dir} has {n} lottery teams.")
+    result = what_if(table, {"current": list(fmt.probs), "alt": cfg["probs"]},
+                     {"current": fmt.total_balls, "alt": cfg["balls"]}, int(cfg["boost"]), **field)
+    return compare(result, pool=position - 1)
+
+
+def write_history(table, out):
+    ext = os.path.splitext(out)[1].lower() if out else ".csv"
+    rows = json.loads(table.reset_index().to_json(orient="records"))
+    if ext == ".json":
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=1)
+    else:
+        write_rows(rows, out, ext)
+
+
+def run_optimize(config, targets, exp_bases=(), totals=(), boosts=(), workers=None):
+    """Sweep odds tables for ``targets`` around one config; returns (names, ranked results).
+
+    The config's own table, pool and boost are always in the sweep; ``exp_bases``,
+    ``totals`` and ``boosts`` add to them.
+    """
+    names, _, cfg = resolve_config(config)
+    if cfg["exp_base"] is not None:
+        exp_bases, tables = sorted({float(cfg["exp_base"]), *exp_bases}), ()
+    else:
+        tables = (cfg["probs"],)
+    totals = sorted({cfg["balls"], *totals})
+    boosts = sorted({int(cfg["boost"]), *boosts})
+    sweep = candidates(len(names), exp_bases, tables, totals, boosts, cfg["consolation_index"])
+    results = optimize(targets, sweep, workers)
+    if not results:
+        raise ValueError("No candidate leaves every lottery team with a ball.")
+    return names, results
+
+
+def optimize_rows(results, targets):
+    """One row per candidate, best first: the flat shape for CSV and Parquet."""
+    for rank, r in enumerate(results, 1):
+        c = r["candidate"]
+        row = {"rank": rank, "feasible": r["violation"] == 0, "margin": r["margin"], "violation": r["violation"],
+               "exp_base": c.exp_base, "balls": c.total_balls, "boost": c.boost, "exact": r["exact"],
+               "probs": ",".join(f"{p:.4g}" for p in c.probs), "counts": ",".join(map(str, r["counts"]))}
+        row.update(zip(targets, r["values"]))
+        yield row
+
+
+def write_optimize(names, results, targets, out):
+    ext = os.path.splitext(out)[1].lower() if out else ".csv"
+    if ext == ".json":
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump([{**row, "teams": names, "matrix": r["matrix"].tolist()}
+                       for row, r in zip(optimize_rows(results, targets), results)], f, indent=1)
+    else:
+        write_rows(list(optimize_rows(results, targets)), out, ext)
+
+
+def floats(text):
+    return tuple(float(v) for v in text.split(",") if v.strip())
+
+
+def ints(text):
+    return tuple(int(v) for v in text.split(",") if v.strip())
+
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="python -m lottery", description=__doc__.split("\n\n")[0])
+    p.add_argument("standings", nargs="?", help="standings CSV (Team, MaxPF, playoff rank)")
+    p.add_argument("--config", help="JSON file with a list of configs (keys = long option names)")
+    p.add_argument("--lottery-teams", type=int, help="teams in the lottery (default 6)")
+    p.add_argument("--playoff-teams", type=int, help="playoff line (default: everyone else)")
+    p.add_argument("--probs", help="comma-separated odds table in percent, worst team first")
+    p.add_argument("--exp-base", type=float, help="exponential odds curve instead of --probs")
+    p.add_argument("--format", choices=list(LEAGUE_FORMATS), help="use a league format's table and pool")
+    p.add_argument("--balls", type=int, help=f"pool size (default {TOTAL_BALLS})")
+    p.add_argument("--consolation", help="'auto' (best non-playoff rank), 'none' or a team name")
+    p.add_argument("--boost", type=int, help="balls moved to the consolation winner (default 1)")
+    p.add_argument("--method", choices=METHODS, help="ball apportionment (default current)")
+    p.add_argument("--mode", choices=("auto", "exact", "montecarlo"), help="default auto")
+    p.add_argument("--sims", type=int, help="Monte Carlo lotteries (default 1,000,000)")
+    p.add_argument("--seed", type=int, help="Monte Carlo seed (default 0)")
+    p.add_argument("--trade", action="append", help="score a ball trade, e.g. 'Phil -> Sherman 10' (repeatable)")
+    p.add_argument("--trades", help="file with one trade per line, scored like --trade")
+    p.add_argument("--rank-by", help="rank trades by this team's gain (default: the biggest gain of any team)")
+    p.add_argument("--history", metavar="DIR",
+                   help="compare every season in a standings folder under the format's own table and this config's")
+    p.add_argument("--position", type=int, default=1, help="pool position --history reports (1 = worst, default)")
+    p.add_argument("--target", action="append",
+                   help="optimizer target, e.g. 'team1 top3 >= 90%%' (repeatable): sweep odds tables instead")
+    p.add_argument("--sweep-exp-base", type=floats, default=(), help="comma-separated exp_base curves --target tries")
+    p.add_argument("--sweep-balls", type=ints, default=(), help="comma-separated pool sizes --target tries")
+    p.add_argument("--sweep-boost", type=ints, default=(), help="comma-separated consolation boosts --target tries")
+    p.add_argument("--workers", type=int, help="processes (default: all cores; 0 = in-process)")
+    p.add_argument("-o", "--out", help="output .csv / .json / .parquet (default: CSV on stdout)")
+    return p
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    overrides = {k: v for k, v in vars(args).items()
+                 if k in DEFAULTS and v is not None}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            configs = [{**c, **overrides} for c in json.load(f)]
+    elif args.standings or overrides or args.history or args.target:
+        configs = [overrides]
+    else:
+        parser.error("give a standings CSV or --config")
+    trades = list(args.trade or [])
+    try:
+        if args.trades:
+            with open(args.trades, encoding="utf-8") as f:
+                trades += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        if args.target:
+            if len(configs) != 1:
+                raise ValueError("--target sweeps around one config; give a single config.")
+            start = time.perf_counter()
+            names, results = run_optimize(configs[0], args.target, args.sweep_exp_base, args.sweep_balls,
+                                          args.sweep_boost, args.workers)
+            write_optimize(names, results, args.target, args.out)
+        elif args.history:
+            if len(configs) != 1:
+                raise ValueError("--history compares one odds table; give a single config.")
+            start = time.perf_counter()
+            results = run_history(args.history, configs[0], args.position)
+            write_history(results, args.out)
+        elif trades:
+            if len(configs) != 1:
+                raise ValueError("--trade scores one pool; give a single config.")
+            start = time.perf_counter()
+            names, results = run_trades(configs[0], trades, args.rank_by)
+            write_trades(names, results, args.out)
+        else:
+            results = run(configs, args.workers)
+            write(results, args.out)
+    except (OSError, ValueError, KeyError) as e:
+        parser.exit(1, f"error: {e}\n")
+    if args.out and args.target:
+        print(f"{len(results)} candidate(s) -> {args.out} ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+    elif args.out and args.history:
+        print(f"{len(results)} season(s) -> {args.out} ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+    elif args.out and trades:
+        print(f"{len(results)} trade(s) -> {args.out} ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+    elif args.out:
+        total = sum(r["seconds"] for r in results)
+        print(f"{len(results)} config(s) -> {args.out} ({total:.2f}s of evaluation)", file=sys.stderr)
+    return 0
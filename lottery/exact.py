@@ -0,0 +1,154 @@
+"""Exact team x pick probabilities under the live redistribution rules.
+
+Each draw removes one team and hands its balls to the rest via
+``rules.redistribute``, so the next state depends on the remaining count
+vector and nothing else. The recursion is memoized on that canonical tuple;
+because rounding makes counts path-dependent, states are keyed by counts rather
+than by the bare subset of teams. The cache is process-wide, so every Streamlit
+session (and every league sharing a ball table) reuses the same tables.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .rules import after_draw, redistribute_batch
+
+
+@lru_cache(maxsize=65536)
+def _pick_matrix(counts, method="current"):
+    n = len(counts)
+    total = sum(counts)
+    if total <= 0:
+        out = np.eye(n)       # nobody left holds a ball: the rest pick in pool order
+    else:
+        out = np.zeros((n, n))
+        for w, c in enumerate(counts):
+            if c <= 0:
+                continue
+            p = c / total
+            out[w, 0] += p
+            sub = _pick_matrix(tuple(after_draw(counts, w, method)), method)
+            others = [i for i in range(n) if i != w]
+            out[others, 1:] += p * sub
+    out.flags.writeable = False
+    return out
+
+
+def pick_probabilities(counts, method="current"):
+    """(teams x picks) matrix: row i, column k = P(team i lands pick k+1).
+
+    ``counts`` are the ball counts of the teams still in the pool, in pool order
+    (worst team first); ``method`` is how a winner's balls are apportioned (see
+    ``lottery.apportion``). Once nobody left holds a ball, the remaining teams
+    take the remaining picks in pool order, as ``replay.replay_orders`` does. The
+    returned array is shared through the cache and is read-only.
+    """
+    counts = tuple(int(c) for c in counts)
+    if not counts:
+        return np.zeros((0, 0))
+    if sum(counts) <= 0:
+        raise ValueError("At least one team must hold a ball.")
+    return _pick_matrix(counts, method)
+
+
+def _merge_rows(columns, bounds):
+    """(first index, inverse) of the distinct rows of a non-negative int matrix
+    whose column j is below ``bounds[j]``. Columns are packed into as few int64
+    words as fit, so the sort runs on a couple of keys instead of whole rows."""
+    words, word, used = [], np.zeros(len(columns), dtype=np.int64), 0
+    for col, bound in zip(columns.T, bounds):
+        bits = max(int(bound - 1).bit_length(), 1)
+        if used + bits > 63:
+            words.append(word)
+            word, used = np.zeros(len(columns), dtype=np.int64), 0
+        word = word << bits | col
+        used += bits
+    words.append(word)
+    order = np.lexsort(words[::-1])
+    new = np.ones(len(order), dtype=bool)
+    new[1:] = np.any([w[order][1:] != w[order][:-1] for w in words], axis=0)
+    inverse = np.empty(len(order), dtype=np.int64)
+    inverse[order] = np.cumsum(new) - 1
+    return order[new], inverse
+
+
+def pick_probabilities_batch(counts_batch, method="current"):
+    """(B x teams x picks) pick matrices for B count vectors of the same length.
+
+    The same recursion as ``pick_probabilities``, run breadth-first over the
+    whole batch: each level expands every state by every possible winner with
+    ``redistribute_batch`` and merges states that reach the same counts, which
+    is what the memo does for one vector. Results match the scalar engine up to
+    float summation order; use it when many vectors share no cached sub-states.
+    """
+    start = np.asarray(counts_batch, dtype=np.int64)
+    if start.ndim != 2:
+        raise ValueError("counts_batch must be a (B x teams) array.")
+    if (start.min(initial=0) < 0) or (start.sum(axis=1) <= 0).any():
+        raise ValueError("Counts must be non-negative with at least one ball per vector.")
+    size, n = start.shape
+    out = np.zeros((size, n, n))
+    # a state is its input row plus each team's balls + 1 (0 = already drawn)
+    bounds = [size] + [int(start.sum(axis=1).max()) + 2] * n
+    row = np.arange(size)
+    counts = start.copy()
+    alive = np.ones((size, n), dtype=bool)
+    reach = np.ones(size)
+    for k in range(n - 1):
+        held = alive & (counts > 0)
+        empty = ~held.any(axis=1)
+        held[empty, alive[empty].argmax(axis=1)] = True     # no balls left: next team in pool order
+        state, w = np.nonzero(held)
+        total = counts.sum(axis=1)[state]
+        q = reach[state] * np.where(empty[state], 1.0, counts[state, w] / np.maximum(total, 1))
+        np.add.at(out, (row[state], w, k), q)
+        row, counts, alive = row[state], counts[state], alive[state]
+        redistribute_batch(counts, alive, w, method)
+        first, merged = _merge_rows(np.column_stack([row, np.where(alive, counts + 1, 0)]), bounds)
+        reach = np.bincount(merged, weights=q, minlength=len(first))
+        row, counts, alive = row[first], counts[first], alive[first]
+    if n:
+        np.add.at(out, (row, alive.argmax(axis=1), n - 1), reach)
+    return out
+
+
+def cache_info():
+    return _pick_matrix.cache_info()
+
+
+@lru_cache(maxsize=256)
+def _proportional_matrix(weights):
+    n = len(weights)
+    out = np.zeros((n, n))
+    reach = np.zeros(1 << n)
+    reach[0] = 1.0
+    for mask in range(1 << n):
+        p = reach[mask]
+        if p == 0.0:
+            continue
+        left = [i for i in range(n) if not mask >> i & 1]
+        total = sum(weights[i] for i in left)
+        pick = n - len(left)
+        if total <= 0:
+            # only weightless teams left: they fill the remaining picks in pool order
+            for k, i in enumerate(left):
+                out[i, pick + k] += p
+            continue
+        for i in left:
+            q = p * weights[i] / total
+            out[i, pick] += q
+            reach[mask | 1 << i] += q
+    out.flags.writeable = False
+    return out
+
+
+def proportional_probabilities(weights):
+    """Pick matrix for the continuous model, where a drawn team's odds are simply
+    renormalized away (no whole-ball rounding). Dynamic programming over the
+    subsets of teams already drawn; the reference the integer rules are judged
+    against.
+    """
+    weights = tuple(float(w) for w in weights)
+    if len(weights) > 20:
+        raise ValueError("Subset DP is limited to 20 teams.")
+    return _proportional_matrix(weights)
@@ -0,0 +1,36 @@
+"""League formats: how many teams, how many reach the playoffs, and the ball
+table the lottery starts from.
+
+The classic format is the league we run today (12 teams, 6 in the lottery,
+200 balls on ``INITIAL_PROBS``). Bigger formats use an ``exp_base`` curve and a
+pool large enough that the best lottery team still holds a few balls.
+"""
+from collections import namedtuple
+
+from .rules import INITIAL_PROBS, TOTAL_BALLS, exp_probs
+
+LeagueFormat = namedtuple("LeagueFormat", "label teams playoff_teams total_balls probs")
+
+# Above this many lottery teams the exact engine's state space gets too big to
+# build on a rerun (8 teams: ~0.1 s, 10 teams: ~3 s), so odds are replayed.
+EXACT_MAX_TEAMS = 8
+
+
+def _format(label, teams, playoff_teams, total_balls, exp_base=None):
+    lottery = teams - playoff_teams
+    probs = tuple(INITIAL_PROBS) if exp_base is None else tuple(exp_probs(exp_base, lottery))
+    return LeagueFormat(label, teams, playoff_teams, total_balls, probs)
+
+
+LEAGUE_FORMATS = {
+    "12": _format("12 teams (classic)", 12, 6, TOTAL_BALLS),
+    "14": _format("14 teams", 14, 6, 1000, exp_base=1.8),
+    "20": _format("20 teams", 20, 8, 2000, exp_base=1.6),
+    "32": _format("32 teams", 32, 16, 5000, exp_base=1.5),
+}
+DEFAULT_FORMAT = "12"
+
+
+def get_format(key):
+    """The format for ``key``; unknown keys fall back to the classic format."""
+    return LEAGUE_FORMATS.get(str(key), LEAGUE_FORMATS[DEFAULT_FORMAT])
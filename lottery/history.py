@@ -0,0 +1,102 @@
+"""Multi-season what-if: every season's pick odds under any ball table.
+
+All seasons are stacked into one Season / Team / MaxPF / Rank table. A team's
+pick probabilities depend only on the odds table, its pool position (MaxPF
+order) and the consolation winner's pool position, so each table needs at most
+``lottery_teams + 1`` matrices (exact, or replayed above ``EXACT_MAX_TEAMS``
+teams, via ``replay.pick_odds``); every season is then filled in with one
+fancy-indexing pass.
+"""
+import numpy as np
+import pandas as pd
+
+from .replay import pick_odds
+from .rules import INITIAL_PROBS, TOTAL_BALLS, initial_counts
+
+PLAYOFF_TEAMS = 6
+LOTTERY_TEAMS = 6
+
+
+def season_table(catalog):
+    """Every parsed season in ``catalog`` as one Season / Team / MaxPF / Rank frame."""
+    frames = [
+        catalog.frame(year)[["Team", "MaxPF", "Rank"]].assign(Season=year)
+        for year in catalog.years()
+        if catalog.frame(year) is not None
+    ]
+    if not frames:
+        return pd.DataFrame(columns=["Season", "Team", "MaxPF", "Rank"])
+    return pd.concat(frames, ignore_index=True)[["Season", "Team", "MaxPF", "Rank"]]
+
+
+def lottery_field(table, playoff_teams=PLAYOFF_TEAMS, lottery_teams=LOTTERY_TEAMS, consolation="auto"):
+    """Lottery teams of every complete season with their pool position
+    (``Pool``, 0 = lowest MaxPF, ties by rank) and the consolation winner's
+    pool position (``Consolation``, -1 for none).
+
+    ``consolation`` follows ``cli.lottery_pool``: ``auto`` (the best non-playoff
+    rank, ``playoff_teams + 1``, won the bracket, as in the simulator), ``none``
+    or a team name (no winner in seasons where that team missed the lottery).
+    """
+    field = table[table["Rank"] > playoff_teams].sort_values(["Season", "Rank"])
+    field = field[field.groupby("Season").cumcount() < lottery_teams]
+    field = field[field.groupby("Season")["Team"].transform("size") == lottery_teams].copy()
+    field["Pool"] = field.groupby("Season")["MaxPF"].rank(method="first").astype(int) - 1
+    if consolation in (None, "none"):
+        won = pd.Series(False, index=field.index)
+    elif consolation == "auto":
+        won = field["Rank"] == playoff_teams + 1
+    else:
+        won = field["Team"] == consolation
+    winners = field[won].drop_duplicates("Season").set_index("Season")["Pool"]
+    field["Consolation"] = field["Season"].map(winners).fillna(-1).astype(int)
+    return field.reset_index(drop=True)
+
+
+def table_probabilities(field, probs, total_balls=TOTAL_BALLS, boost=1):
+    """(rows x picks) pick probabilities for every row of ``field`` under ``probs``."""
+    options = np.unique(field["Consolation"].to_numpy())
+    stack = np.stack([
+        pick_odds(initial_counts(probs, total_balls, None if c < 0 else int(c), boost))[0]
+        for c in options
+    ])
+    which = np.searchsorted(options, field["Consolation"].to_numpy())
+    return stack[which, field["Pool"].to_numpy()]
+
+
+def what_if(table, tables=None, total_balls=TOTAL_BALLS, boost=1, **field_kwargs):
+    """Per-team pick odds for every season under each named odds table.
+
+    ``tables`` maps a label to a worst-first probability table (defaults to
+    ``{"current": INITIAL_PROBS}``); ``total_balls`` is one pool size or a
+    {label: pool size} mapping. Adds ``<label> P<k>`` columns and
+    ``<label> E[pick]`` (expected pick number) to the lottery field.
+    """
+    tables = {"current": INITIAL_PROBS} if tables is None else tables
+    pools = total_balls if isinstance(total_balls, dict) else dict.fromkeys(tables, total_balls)
+    field = lottery_field(table, **field_kwargs)
+    picks = np.arange(1, field["Pool"].max() + 2) if len(field) else np.arange(1, 1)
+    columns = {}
+    for label, probs in tables.items():
+        if len(probs) != len(picks):
+            raise ValueError(f"Table {label!r} needs {len(picks)} entries.")
+        probs_by_row = table_probabilities(field, probs, pools[label], boost)
+        for k in range(len(picks)):
+            columns[f"{label} P{k + 1}"] = probs_by_row[:, k]
+        columns[f"{label} E[pick]"] = probs_by_row @ picks
+    return pd.concat([field, pd.DataFrame(columns, index=field.index)], axis=1)
+
+
+def compare(result, base="current", alt="alt", pool=0):
+    """One row per season for the team at pool position ``pool`` (0 = worst):
+    pick-1 odds and expected pick under ``base`` vs ``alt``."""
+    rows = result[result["Pool"] == pool].set_index("Season")
+    out = pd.DataFrame({
+        "Team": rows["Team"],
+        f"{base} P1": rows[f"{base} P1"],
+        f"{alt} P1": rows[f"{alt} P1"],
+        f"{base} E[pick]": rows[f"{base} E[pick]"],
+        f"{alt} E[pick]": rows[f"{alt} E[pick]"],
+    })
+    out["better under alt"] = out[f"{alt} E[pick]"] < out[f"{base} E[pick]"]
+    return out
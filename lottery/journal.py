@@ -0,0 +1,186 @@
+"""Append-only draw journal, so a server restart or a reloaded tab can pick the
+draw back up where it stopped.
+
+One JSON object per line: a ``snapshot`` record (the whole ``LotteryState``
+plus whatever app metadata the caller passes) whenever balls are assigned,
+then one ``draw`` record per submitted ball. Restoring reads the last snapshot
+and replays the draws after it through ``LotteryState.draw``, which is the same
+code the live app runs. Every record is flushed and fsynced before the call
+returns; a torn last line from a crash mid-write is cut off on the next load.
+
+A ``draw`` record carries the pick it decides and the ``LotteryState.fingerprint``
+of the state it was drawn from. ``DrawJournal.draw`` checks both against the
+journal's tail, then draws and appends under one lock, so two tabs holding
+copies of the same draw cannot both decide a pick: the one behind gets
+``StaleDraw``. The tail is kept in memory (checked against the file size), so
+a draw never re-reads the file. A load cuts off any record that does not follow
+from the one before it, as it does a torn line.
+
+Journaling is best-effort: an ``OSError`` (read-only disk, ``Journals`` not a
+directory, disk full) never stops a draw. It is kept in ``DrawJournal.error``
+for the caller to show, and draws on that path go unjournaled until the next
+successful ``start``.
+"""
+import json
+import os
+import threading
+import time
+
+from .state import LotteryState
+
+JOURNAL_VERSION = 1
+
+_locks = {}
+_tails = {}             # abspath -> (file size, next pick, fingerprint) at the journal's tail, or _OFF
+_OFF = "off"            # journaling failed on this path: draw without it
+_locks_guard = threading.Lock()
+
+
+def _lock(path):
+    with _locks_guard:
+        return _locks.setdefault(os.path.abspath(path), threading.RLock())
+
+
+class StaleDraw(ValueError):
+    """A draw made from a state the journal has already moved past."""
+
+
+class DrawJournal:
+    """Journal for one draw, stored at ``path`` (created on first write)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.error = None   # the OSError that switched journaling off, if any
+
+    def _append(self, record, truncate=False):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with open(self.path, "w" if truncate else "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _remember(self, state):
+        _tails[os.path.abspath(self.path)] = (os.path.getsize(self.path), len(state.draft) + 1,
+                                              state.fingerprint())
+
+    def _tail(self):
+        """(next pick, fingerprint) of the journaled state, or None without one."""
+        tail = _tails.get(os.path.abspath(self.path))
+        try:
+            if tail is not None and tail[0] == os.path.getsize(self.path):
+                return tail[1:]
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self._fail(e)
+            return None
+        return None if self.load() is None else _tails[os.path.abspath(self.path)][1:]
+
+    def _fail(self, error):
+        self.error = error
+        _tails[os.path.abspath(self.path)] = _OFF
+
+    def _checkpoint(self, state, meta, truncate):
+        self.error = None
+        with _lock(self.path):
+            try:
+                self._append({"op": "snapshot", "v": JOURNAL_VERSION, "t": time.time(),
+                              "state": state.snapshot(), "meta": meta or {}}, truncate)
+                self._remember(state)
+            except OSError as e:
+                self._fail(e)
+        return self.error is None
+
+    def start(self, state, meta=None):
+        """Begin a new journal from ``state`` (drops any previous draw). False,
+        with ``error`` set, if it could not be written."""
+        return self._checkpoint(state, meta, truncate=True)
+
+    def snapshot(self, state, meta=None):
+        """Checkpoint ``state`` so a restore replays only what comes after it."""
+        return self._checkpoint(state, meta, truncate=False)
+
+    def draw(self, state, ball):
+        """Draw ``ball`` on ``state`` and journal it as one step; returns the
+        winning team index. Raises StaleDraw (drawing nothing) unless ``state``
+        is the journal's tail, or ValueError for a ball ``state`` rejects."""
+        with _lock(self.path):
+            pick, rev = len(state.draft) + 1, state.fingerprint()
+            key = os.path.abspath(self.path)
+            tail = None if _tails.get(key) is _OFF else self._tail()
+            if _tails.get(key) is _OFF:         # off already, or reading the tail just failed
+                return state.draw(ball)
+            if tail is None:
+                raise StaleDraw("This draw's journal is gone (it was reset in another tab).")
+            if tail != (pick, rev):
+                raise StaleDraw(f"This draw has moved on to pick {tail[0]} in another tab.")
+            winner = state.draw(ball)
+            try:
+                self._append({"op": "draw", "t": time.time(), "pick": pick, "rev": rev, "ball": int(ball)})
+                self._remember(state)
+            except OSError as e:
+                self._fail(e)
+            return winner
+
+    def _read(self):
+        """(records, ends): every complete record, oldest first, and the byte
+        offset just past each one."""
+        out, ends, end = [], [], 0
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError
+                        out.append(json.loads(line))
+                    except ValueError:
+                        break                     # torn write: nothing after it is trusted
+                    end += len(line)
+                    ends.append(end)
+        except FileNotFoundError:
+            pass
+        return out, ends
+
+    def records(self):
+        """Every complete record in the journal, oldest first."""
+        return self._read()[0]
+
+    def load(self):
+        """(state, meta, draws) rebuilt from the journal, or None if it holds no
+        draw. ``draws`` lists the ball numbers replayed on top of the snapshot."""
+        with _lock(self.path):
+            try:
+                records, ends = self._read()
+            except OSError as e:
+                self._fail(e)
+                return None
+            last = max((i for i, r in enumerate(records) if r.get("op") == "snapshot"
+                        and r.get("v") == JOURNAL_VERSION), default=None)
+            if last is None:
+                return None
+            state = LotteryState.from_snapshot(records[last]["state"])
+            draws, end = [], ends[last]
+            for r, r_end in zip(records[last + 1:], ends[last + 1:]):
+                if r.get("op") == "draw":
+                    if state.complete or r.get("pick") != len(state.draft) + 1 \
+                            or r.get("rev") != state.fingerprint():
+                        break                     # drawn from some other state: not this draw's
+                    state.draw(r["ball"])
+                    draws.append(r["ball"])
+                end = r_end
+            try:
+                if end < os.path.getsize(self.path):
+                    os.truncate(self.path, end)   # drop the torn tail before anything appends to it
+                self._remember(state)
+            except OSError as e:
+                self._fail(e)                     # still a good restore; just not appendable
+            return state, records[last]["meta"], draws
+
+    def clear(self):
+        with _lock(self.path):
+            _tails.pop(os.path.abspath(self.path), None)
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
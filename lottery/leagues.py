@@ -0,0 +1,35 @@
+"""League registry for hosting several draws from one server.
+
+The default league reads ``Standings/``; any other league is a folder
+``Leagues/<league_id>/`` holding its own ``Dynasty{YEAR}.csv`` files. Parsed
+standings and probability tables are cached process-wide (see
+``standings.get_catalog`` and ``exact``), so every session of every league
+shares them; draw state stays per session and per league.
+"""
+import os
+import re
+
+DEFAULT_LEAGUE = "dynasty"
+LEAGUE_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def list_leagues(leagues_dir, default_dir):
+    """{league_id: standings_dir}, default league first."""
+    leagues = {DEFAULT_LEAGUE: default_dir}
+    try:
+        with os.scandir(leagues_dir) as it:
+            for entry in sorted(it, key=lambda e: e.name):
+                if entry.is_dir() and LEAGUE_ID_RE.match(entry.name) and entry.name != DEFAULT_LEAGUE:
+                    leagues[entry.name] = entry.path
+    except FileNotFoundError:
+        pass
+    return leagues
+
+
+def resolve_league(league_id, leagues_dir, default_dir):
+    """(league_id, standings_dir) for a requested ID; unknown or malformed IDs
+    fall back to the default league."""
+    leagues = list_leagues(leagues_dir, default_dir)
+    if league_id and LEAGUE_ID_RE.match(league_id) and league_id in leagues:
+        return league_id, leagues[league_id]
+    return DEFAULT_LEAGUE, default_dir
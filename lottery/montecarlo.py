@@ -0,0 +1,104 @@
+"""Batched Monte Carlo for weighted draws without replacement.
+
+Uses the exponential race (equivalent to Gumbel-top-k): a team's key is
+``E / w`` with ``E ~ Exp(1)``, and sorting a row of keys ascending gives one
+draft order. This is the continuous-odds model of ``simulator/streamlit.py``,
+where a drawn team's weight is renormalized away; for the live app's
+whole-ball rules see ``lottery.exact``.
+"""
+import numpy as np
+
+CHUNK_SIZE = 1 << 18
+BATCH_SIZE = 50_000
+
+
+def draw_orders(weights, num_sims, rng=None):
+    """(num_sims x teams) int8 array; row s, column k = team index at pick k+1."""
+    rng = np.random.default_rng(rng)
+    w = np.asarray(weights, dtype=np.float64)
+    if w.ndim != 1 or len(w) > 127:
+        raise ValueError("weights must be a 1-D vector of at most 127 teams.")
+    if np.any(w < 0) or not np.any(w > 0):
+        raise ValueError("weights must be non-negative with at least one positive entry.")
+    with np.errstate(divide="ignore"):
+        inv_w = (1.0 / w).astype(np.float32)   # zero weight -> inf -> always drawn last
+    keys = rng.standard_exponential((num_sims, len(w)), dtype=np.float32)
+    keys *= inv_w
+    return np.argsort(keys, axis=1).astype(np.int8)
+
+
+def pick_histogram(orders, num_teams=None):
+    """(teams x picks) int64 counts of how often each team landed each pick."""
+    orders = np.asarray(orders)
+    n = orders.shape[1] if num_teams is None else num_teams
+    hist = np.zeros((n, orders.shape[1]), dtype=np.int64)
+    for k in range(orders.shape[1]):
+        hist[:, k] = np.bincount(orders[:, k], minlength=n)
+    return hist
+
+
+def order_batches(weights, num_sims, rng=None, batch_size=BATCH_SIZE):
+    """Yield ``num_sims`` draws as successive ``draw_orders`` arrays of at most
+    ``batch_size`` rows. The generator consumes ``rng`` row by row, so the draws
+    are the same whatever the batch size."""
+    rng = np.random.default_rng(rng)
+    done = 0
+    while done < num_sims:
+        size = min(batch_size, num_sims - done)
+        yield draw_orders(weights, size, rng)
+        done += size
+
+
+class PickTally:
+    """Running team x pick histogram fed one batch of orders at a time."""
+
+    __slots__ = ("hist", "sims")
+
+    def __init__(self, num_teams):
+        self.hist = np.zeros((num_teams, num_teams), dtype=np.int64)
+        self.sims = 0
+
+    def add(self, orders):
+        self.hist += pick_histogram(orders, len(self.hist))
+        self.sims += len(orders)
+        return self
+
+    def summary(self, z=1.96, percentiles=(10, 50, 90)):
+        """Per-team stats so far, as arrays indexed by team.
+
+        ``probs`` with ``probs_low``/``probs_high`` (normal-approximation interval at
+        ``z``), ``mean`` pick with ``mean_low``/``mean_high``, and ``p<q>`` = the
+        first pick by which a team has landed in at least q% of draws.
+        """
+        picks = np.arange(1, len(self.hist) + 1)
+        sims = max(self.sims, 1)
+        probs = self.hist / sims
+        margin = z * np.sqrt(probs * (1 - probs) / sims)
+        mean = probs @ picks
+        spread = z * np.sqrt(np.maximum(probs @ picks ** 2 - mean ** 2, 0) / sims)
+        cdf = np.cumsum(probs, axis=1)
+        out = {"sims": self.sims, "probs": probs, "probs_low": np.clip(probs - margin, 0, 1),
+               "probs_high": np.clip(probs + margin, 0, 1), "mean": mean,
+               "mean_low": mean - spread, "mean_high": mean + spread}
+        for q in percentiles:
+            out[f"p{q}"] = 1 + np.argmax(cdf >= q / 100 - 1e-12, axis=1)
+        return out
+
+
+def simulate_orders(weights, num_sims, rng=None, keep_orders=True, chunk_size=CHUNK_SIZE):
+    """Run ``num_sims`` draws in fixed-size chunks.
+
+    Returns ``(orders, hist)``; ``orders`` is None when ``keep_orders`` is False so
+    that very large runs only keep the aggregated histogram in memory.
+    """
+    n = len(weights)
+    tally = PickTally(n)
+    chunks = []
+    for orders in order_batches(weights, num_sims, rng, chunk_size):
+        tally.add(orders)
+        if keep_orders:
+            chunks.append(orders)
+    if not keep_orders:
+        return None, tally.hist
+    orders = np.concatenate(chunks) if chunks else np.zeros((0, n), dtype=np.int8)
+    return orders, tally.hist
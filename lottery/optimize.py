@@ -0,0 +1,105 @@
+"""Search odds tables for ones that meet league-chosen targets.
+
+Candidates combine a ball table (explicit, or an ``exp_base`` curve), a pool
+size and a consolation boost; each one is scored under the live whole-ball
+rules, exactly up to ``EXACT_MAX_TEAMS`` teams and by seeded replay above that
+(``replay.pick_odds``), in parallel across a process pool.
+
+Targets are short strings, teams numbered worst-first as in the simulator::
+
+    "team1 top3 >= 90%"     worst team lands a top-3 pick at least 90% of the time
+    "team6 pick1 <= 1%"     6th-worst team wins pick 1 at most 1% of the time
+"""
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+
+from .replay import pick_odds
+from .rules import TOTAL_BALLS, exp_probs, initial_counts
+
+Target = namedtuple("Target", "team kind picks op value")
+Candidate = namedtuple("Candidate", "probs total_balls boost consolation exp_base")
+
+_TARGET_RE = re.compile(
+    r"^\s*(?:team\s*(\d+)|(worst))\s+(top|pick)\s*(\d+)\s*(>=|<=)\s*([\d.]+)\s*(%?)\s*$",
+    re.IGNORECASE,
+)
+
+
+def parse_target(text):
+    """``"team1 top3 >= 90%"`` -> Target(team=0, kind='top', picks=3, op='>=', value=0.9)."""
+    m = _TARGET_RE.match(text)
+    if not m:
+        raise ValueError(f"Cannot parse target {text!r}; expected e.g. 'team1 top3 >= 90%'.")
+    team = 0 if m.group(2) else int(m.group(1)) - 1
+    value = float(m.group(6)) / (100 if m.group(7) else 1)
+    return Target(team, m.group(3).lower(), int(m.group(4)), m.group(5), value)
+
+
+def target_value(matrix, target):
+    row = matrix[target.team]
+    if target.kind == "pick":
+        return float(row[target.picks - 1])
+    return float(row[:target.picks].sum())
+
+
+def slack(matrix, target):
+    """How comfortably ``target`` is met (negative when it is missed)."""
+    value = target_value(matrix, target)
+    return value - target.value if target.op == ">=" else target.value - value
+
+
+def candidates(num_teams, exp_bases=(), tables=(), totals=(TOTAL_BALLS,), boosts=(1,), consolation=None):
+    """Cartesian sweep of curves/tables x pool sizes x boost sizes."""
+    if consolation is None:
+        boosts = (0,)                 # nobody to boost: one candidate per table and pool
+    curves = [(exp_probs(b, num_teams), b) for b in exp_bases]
+    curves += [(list(t), None) for t in tables]
+    for (probs, base), total, boost in product(curves, totals, boosts):
+        if len(probs) != num_teams:
+            raise ValueError(f"Every table needs {num_teams} entries.")
+        yield Candidate(probs, total, boost, consolation, base)
+
+
+def evaluate(candidate, targets):
+    counts = initial_counts(candidate.probs, candidate.total_balls, candidate.consolation, candidate.boost)
+    if min(counts) < 1:
+        return None                   # every lottery team must hold at least one ball
+    matrix, exact = pick_odds(counts)
+    slacks = [slack(matrix, t) for t in targets]
+    return {
+        "candidate": candidate,
+        "counts": counts,
+        "matrix": np.asarray(matrix),
+        "exact": exact,
+        "values": [target_value(matrix, t) for t in targets],
+        "violation": float(sum(-s for s in slacks if s < 0)),
+        "margin": float(min(slacks)) if slacks else 0.0,
+    }
+
+
+def _evaluate_all(args):
+    chunk, targets = args
+    return [evaluate(c, targets) for c in chunk]
+
+
+def optimize(targets, candidate_list, workers=None, chunk_size=32):
+    """Score every candidate and return results best-first.
+
+    Feasible candidates (zero violation) come first, ordered by their tightest
+    margin; the rest follow by total shortfall. ``workers=0`` runs in-process.
+    """
+    targets = [parse_target(t) if isinstance(t, str) else t for t in targets]
+    candidate_list = list(candidate_list)
+    chunks = [(candidate_list[i:i + chunk_size], targets) for i in range(0, len(candidate_list), chunk_size)]
+    if workers == 0:
+        scored = map(_evaluate_all, chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scored = list(pool.map(_evaluate_all, chunks))
+    results = [r for batch in scored for r in batch if r is not None]
+    results.sort(key=lambda r: (r["violation"], -r["margin"]))
+    return results
@@ -0,0 +1,53 @@
+"""Seeded simulation batches spread over a process pool.
+
+``num_sims`` is cut into fixed-size chunks and chunk ``i`` always draws from
+``rng.stream(seed, rules, i)``, so a run's histogram depends only on the seed,
+the chunk size and the inputs: the same with 1 worker or 16, and it scales with
+the number of cores.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .montecarlo import CHUNK_SIZE, draw_orders, pick_histogram
+from .replay import replay_orders
+from .rng import stream
+
+RULES = {
+    "proportional": draw_orders,   # continuous odds (the simulator's model)
+    "whole_ball": replay_orders,   # the live app's redistribution rules
+}
+
+
+def _chunk_histogram(args):
+    rules, weights, size, seed, index, method = args
+    rng = stream(seed, rules, index)
+    if rules == "whole_ball":
+        orders = replay_orders(weights, size, rng, method)
+    else:
+        orders = draw_orders(weights, size, rng)
+    return pick_histogram(orders, len(weights))
+
+
+def simulate_histogram(weights, num_sims, seed, rules="proportional", workers=None,
+                       chunk_size=CHUNK_SIZE, method="current"):
+    """Team x pick counts over ``num_sims`` seeded lotteries.
+
+    ``weights`` are odds (``proportional``) or ball counts (``whole_ball``), worst
+    team first; ``method`` apportions each draw under ``whole_ball``. ``workers=0``
+    runs in-process; the result is identical either way.
+    """
+    if rules not in RULES:
+        raise ValueError(f"rules must be one of {', '.join(RULES)}.")
+    weights = tuple(weights)
+    sizes = [min(chunk_size, num_sims - start) for start in range(0, num_sims, chunk_size)]
+    jobs = [(rules, weights, size, seed, i, method) for i, size in enumerate(sizes)]
+    hist = np.zeros((len(weights), len(weights)), dtype=np.int64)
+    if workers == 0 or len(jobs) <= 1:
+        parts = map(_chunk_histogram, jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_chunk_histogram, jobs))
+    for part in parts:
+        hist += part
+    return hist
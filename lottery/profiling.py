@@ -0,0 +1,101 @@
+"""Opt-in per-rerun timing for the live app.
+
+A ``RerunTracer`` lives in one session. Each script or fragment rerun becomes a
+run holding timed, possibly nested sections and the byte size of every HTML /
+iframe payload sent; submit-to-reveal latency is kept per pick. ``NULL_TRACER``
+has the same interface and does nothing, so instrumented code needs no checks.
+"""
+import json
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+
+class NullTracer:
+    enabled = False
+
+    def begin(self, kind):
+        pass
+
+    def end(self):
+        pass
+
+    def section(self, name):
+        return nullcontext()
+
+    def payload(self, name, body):
+        pass
+
+    def submitted(self, pick):
+        pass
+
+    def revealed(self, pick):
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class RerunTracer(NullTracer):
+    enabled = True
+
+    def __init__(self, max_runs=500):
+        self.runs = deque(maxlen=max_runs)
+        self.picks = []
+        self.current = None
+        self._depth = 0
+        self._submitted = {}
+
+    def begin(self, kind):
+        if self.current is not None:
+            self.end()                       # previous run died mid-way (exception / stop)
+        self.current = {"kind": kind, "at": time.time(), "t0": time.perf_counter(),
+                        "sections": [], "payloads": []}
+        self._depth = 0
+
+    def end(self):
+        run, self.current = self.current, None
+        if run is None:
+            return
+        run["total_ms"] = (time.perf_counter() - run.pop("t0")) * 1e3
+        run["payload_bytes"] = sum(p["bytes"] for p in run["payloads"])
+        self.runs.append(run)
+
+    @contextmanager
+    def section(self, name):
+        """Time a named block; outside any run (a fragment rerun) it opens its own."""
+        own_run = self.current is None
+        if own_run:
+            self.begin(name)
+        entry = {"name": name, "depth": self._depth}
+        self.current["sections"].append(entry)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry["ms"] = (time.perf_counter() - start) * 1e3
+            self._depth -= 1
+            if own_run:
+                self.end()
+
+    def payload(self, name, body):
+        if self.current is not None:
+            self.current["payloads"].append({"name": name, "bytes": len(body.encode("utf-8"))})
+
+    def submitted(self, pick):
+        self._submitted[pick] = time.perf_counter()
+
+    def revealed(self, pick):
+        start = self._submitted.pop(pick, None)
+        if start is not None:
+            self.picks.append({"pick": pick, "submit_to_reveal_ms": (time.perf_counter() - start) * 1e3})
+
+    def last_run(self, kind=None):
+        for run in reversed(self.runs):
+            if kind is None or run["kind"] == kind:
+                return run
+        return None
+
+    def to_json(self):
+        return json.dumps({"runs": list(self.runs), "picks": self.picks}, indent=2)
@@ -0,0 +1,140 @@
+"""Batch replay of the live app's whole-ball rules.
+
+Runs many lotteries side by side as a (num_sims x teams) count matrix: each
+pick draws a ball uniformly from every row's pool, then hands the winner's
+balls to the rest with the same ``round()`` shares and round-robin fix-up as
+``rules.redistribute``. No Streamlit state is touched.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .exact import pick_probabilities, proportional_probabilities
+from .montecarlo import CHUNK_SIZE, pick_histogram
+from .formats import EXACT_MAX_TEAMS
+from .apportion import METHODS
+from .rng import stream
+from .rules import INITIAL_PROBS, TOTAL_BALLS, initial_counts, redistribute_batch
+
+ODDS_SIMS = 20_000
+
+
+def replay_orders(counts, num_sims, rng=None, method="current"):
+    """(num_sims x teams) int8 draft orders under the whole-ball rules."""
+    rng = np.random.default_rng(rng)
+    start = np.asarray(counts, dtype=np.int64)
+    n = len(start)
+    if n > 127:
+        raise ValueError("At most 127 teams are supported.")
+    counts = np.tile(start, (num_sims, 1))
+    alive = np.ones((num_sims, n), dtype=bool)
+    rows = np.arange(num_sims)
+    orders = np.empty((num_sims, n), dtype=np.int8)
+    for k in range(n):
+        total = counts.sum(axis=1)
+        ball = rng.random(num_sims) * total
+        winner = (np.cumsum(counts, axis=1) > ball[:, None]).argmax(axis=1)
+        empty = total <= 0
+        if empty.any():
+            # nobody left holds a ball: next team in pool order takes the pick
+            winner[empty] = alive[empty].argmax(axis=1)
+        orders[:, k] = winner
+        if k < n - 1:
+            redistribute_batch(counts, alive, winner, method)
+        else:
+            alive[rows, winner] = False
+    return orders
+
+
+def replay_histogram(counts, num_sims, rng=None, chunk_size=CHUNK_SIZE, method="current"):
+    """Team x pick counts over ``num_sims`` replayed lotteries."""
+    rng = np.random.default_rng(rng)
+    n = len(counts)
+    hist = np.zeros((n, n), dtype=np.int64)
+    done = 0
+    while done < num_sims:
+        size = min(chunk_size, num_sims - done)
+        hist += pick_histogram(replay_orders(counts, size, rng, method), n)
+        done += size
+    return hist
+
+
+@lru_cache(maxsize=1024)
+def _replayed_odds(counts, num_sims, seed, method):
+    out = replay_histogram(counts, num_sims, stream(seed, "pick_odds"), method=method) / num_sims
+    out.flags.writeable = False
+    return out
+
+
+def pick_odds(counts, exact_max_teams=EXACT_MAX_TEAMS, num_sims=ODDS_SIMS, seed=0, method="current"):
+    """(matrix, exact): pick probabilities for the teams still in the pool.
+
+    Exact up to ``exact_max_teams`` teams; beyond that a seeded replay of
+    ``num_sims`` lotteries (standard error under 0.4 pp), cached on the counts
+    so every rerun and session at the same state sees the same numbers.
+    """
+    counts = tuple(int(c) for c in counts)
+    if len(counts) <= exact_max_teams:
+        return pick_probabilities(counts, method), True
+    if sum(counts) <= 0:
+        raise ValueError("At least one team must hold a ball.")
+    return _replayed_odds(counts, num_sims, seed, method), False
+
+
+def rounding_report(probs=INITIAL_PROBS, total_balls=TOTAL_BALLS, consolation=None,
+                    num_sims=1_000_000, rng=None, method="current"):
+    """How far whole-ball rounding moves the real odds away from ``probs``.
+
+    Returns a dict of (teams x picks) matrices, all as probabilities:
+    ``intended`` (continuous model on ``probs``), ``replay`` (simulated under the
+    integer rules), ``exact`` (the same rules, computed exactly) and their
+    differences, plus the pick-1 odds implied by the starting ball counts.
+    ``method`` apportions both the starting pool and every draw.
+    """
+    counts = initial_counts(probs, total_balls, consolation, method=method)
+    intended = proportional_probabilities(probs)
+    replay = replay_histogram(counts, num_sims, rng, method=method) / num_sims
+    exact = pick_probabilities(counts, method)
+    return {
+        "counts": counts,
+        "initial_odds": np.asarray(counts) / total_balls,
+        "intended_odds": np.asarray(probs, dtype=np.float64) / sum(probs),
+        "intended": intended,
+        "replay": replay,
+        "exact": exact,
+        "replay_minus_intended": replay - intended,
+        "exact_minus_intended": exact - intended,
+        "max_abs_distortion": float(np.abs(exact - intended).max()),
+        "stderr": np.sqrt(replay * (1 - replay) / num_sims),
+    }
+
+
+def compare_methods(probs=INITIAL_PROBS, total_balls=TOTAL_BALLS, consolation=None, methods=METHODS,
+                    num_sims=200_000, seed=0):
+    """How far each apportionment method moves the odds away from ``probs``,
+    least distortion first.
+
+    One dict per method: starting ``counts``, ``initial_error`` (largest gap
+    between the pick-1 odds the counts give and ``probs``), ``max_abs_distortion``
+    and ``mean_abs_distortion`` over the whole team x pick matrix, and whether it
+    was computed ``exact``ly (otherwise replayed ``num_sims`` times).
+    """
+    intended = proportional_probabilities(probs)
+    target = np.asarray(probs, dtype=np.float64) / sum(probs)
+    rows = []
+    for method in methods:
+        counts = initial_counts(probs, total_balls, consolation, method=method)
+        if min(counts) < 1:
+            continue                      # a team with no balls is not a valid table
+        matrix, exact = pick_odds(counts, num_sims=num_sims, seed=seed, method=method)
+        gap = np.abs(matrix - intended)
+        rows.append({
+            "method": method,
+            "counts": counts,
+            "initial_error": float(np.abs(np.asarray(counts) / total_balls - target).max()),
+            "max_abs_distortion": float(gap.max()),
+            "mean_abs_distortion": float(gap.mean()),
+            "exact": exact,
+        })
+    rows.sort(key=lambda r: r["max_abs_distortion"])
+    return rows
@@ -0,0 +1,42 @@
+"""Reproducible, independent random streams.
+
+Everything random in this package takes an ``rng`` argument that goes through
+``numpy.random.default_rng``; this module builds those generators from one
+integer seed. ``stream(seed, "assign")`` names a stream for a purpose, and
+``stream(seed, "replay", i)`` gives batch ``i`` its own. Streams are
+``SeedSequence`` spawn keys on a counter-based Philox generator by default, so
+they never overlap, and a batch's numbers don't depend on which process ran it
+or in what order.
+"""
+import secrets
+import zlib
+
+import numpy as np
+
+BIT_GENERATORS = {"philox": np.random.Philox, "pcg64": np.random.PCG64}
+DEFAULT_BIT_GENERATOR = "philox"
+
+
+def new_seed():
+    """A fresh 48-bit seed: short enough to write down, and exact in a browser
+    number input."""
+    return secrets.randbits(48)
+
+
+def _key(part):
+    return part if isinstance(part, int) else zlib.crc32(str(part).encode("utf-8"))
+
+
+def seed_sequence(seed, *path):
+    """The ``SeedSequence`` for the stream named by ``path`` (ints or strings)."""
+    return np.random.SeedSequence(seed, spawn_key=tuple(_key(p) for p in path))
+
+
+def stream(seed, *path, bit_generator=DEFAULT_BIT_GENERATOR):
+    """Generator for stream ``path`` under ``seed``: same seed and path, same numbers."""
+    return np.random.Generator(BIT_GENERATORS[bit_generator](seed_sequence(seed, *path)))
+
+
+def spawn(seed, n, *path, bit_generator=DEFAULT_BIT_GENERATOR):
+    """``n`` independent generators under ``path``, e.g. one per worker."""
+    return [stream(seed, *path, i, bit_generator=bit_generator) for i in range(n)]
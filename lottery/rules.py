@@ -0,0 +1,89 @@
+"""Pure ball-count rules shared by the live app and the headless engines.
+
+Teams are always indexed worst-first (ascending MaxPF), which is the insertion
+order of ``ball_distribution`` in the live app, so tie-breaks line up exactly.
+"""
+import numpy as np
+
+from .apportion import COMMON_POOL_SIZES, apportion, pool_tables, starting_counts
+
+TOTAL_BALLS = 200
+INITIAL_PROBS = [71.98, 16.17, 8.00, 2.67, 0.89, 0.30]
+
+
+def initial_counts(probs=INITIAL_PROBS, total_balls=TOTAL_BALLS, consolation=None, boost=1,
+                   method="current"):
+    """Starting ball counts, worst team first.
+
+    Rounds ``total_balls * probs[i] / 100`` and dumps the residue on the worst
+    team (or apportions with another ``apportion`` method), then moves
+    ``boost`` balls from the biggest holder (2nd biggest if that is the
+    consolation winner itself) to ``consolation`` (an index, or None).
+    Common pool sizes come from the cached ``pool_tables``.
+    """
+    if total_balls in COMMON_POOL_SIZES:
+        counts = list(pool_tables(tuple(probs), method)[total_balls])
+    else:
+        counts = starting_counts(probs, [total_balls], method)[0].tolist()
+    if consolation is not None:
+        order = range(len(counts))
+        donor = max(order, key=lambda i: counts[i])                        # most balls
+        if donor == consolation:
+            donor = sorted(order, key=lambda i: counts[i], reverse=True)[1]  # 2nd most
+        counts[donor] -= boost
+        counts[consolation] += boost
+    return counts
+
+
+def exp_probs(exp_base, num_teams):
+    """Exponential odds curve in percent, worst team first: team i weighs
+    ``exp_base ** (num_teams - i)``. The simulator's sliders start from it."""
+    odds = [exp_base ** (num_teams - i) for i in range(num_teams)]
+    return [100 * o / sum(odds) for o in odds]
+
+
+def redistribute(counts, winner, method="current"):
+    """Extra balls each other team receives when ``counts[winner]`` is drawn.
+
+    ``counts`` holds the teams still in the pool; the result is aligned with
+    ``counts`` minus the winner. Whole balls move in proportion to the current
+    counts with ``round()``, and any shortfall/overshoot is patched one ball at a
+    time round-robin from the largest share down; any other ``method`` hands
+    them out with ``apportion``.
+    """
+    moved = counts[winner]
+    remaining = [c for i, c in enumerate(counts) if i != winner]
+    total_remaining = sum(remaining)
+    if total_remaining <= 0:
+        return [0] * len(remaining)
+    if method != "current":
+        return apportion(remaining, moved, method).tolist()
+    proportions = [c / total_remaining for c in remaining]
+    extra = [round(moved * p) for p in proportions]
+    diff = moved - sum(extra)
+    if diff != 0:
+        by_prop = sorted(range(len(remaining)), key=lambda i: proportions[i], reverse=True)
+        step = 1 if diff > 0 else -1
+        for i in range(abs(diff)):
+            extra[by_prop[i % len(by_prop)]] += step
+    return extra
+
+
+def after_draw(counts, winner, method="current"):
+    """Ball counts of the teams left in the pool once ``counts[winner]`` is drawn."""
+    extra = redistribute(counts, winner, method)
+    remaining = [c for i, c in enumerate(counts) if i != winner]
+    return [c + e for c, e in zip(remaining, extra)]
+
+
+def redistribute_batch(counts, alive, winner, method="current"):
+    """Vectorized ``redistribute`` for a batch, applied in place.
+
+    ``counts`` is (S x n) int64 and ``alive`` (S x n) bool, both in pool order;
+    ``winner`` holds one team index per row and must still be alive.
+    """
+    rows = np.arange(len(counts))
+    moved = counts[rows, winner].copy()
+    counts[rows, winner] = 0
+    alive[rows, winner] = False
+    counts += apportion(counts, moved, method, eligible=alive)
@@ -0,0 +1,41 @@
+"""One-ball finite differences of the exact pick matrix.
+
+Every perturbed vector shares most of its sub-states with its neighbours, so
+the whole tensor rides on the exact engine's cache: the first call costs a few
+hundred small recursions, repeats are free.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from .exact import pick_probabilities
+
+
+@lru_cache(maxsize=256)
+def _sensitivity(counts):
+    n = len(counts)
+    base = pick_probabilities(counts)
+    out = np.zeros((n, n, n, n))
+    for src in range(n):
+        if counts[src] < 1:
+            continue
+        for dst in range(n):
+            if dst == src:
+                continue
+            moved = list(counts)
+            moved[src] -= 1
+            moved[dst] += 1
+            out[src, dst] = pick_probabilities(moved) - base
+    out.flags.writeable = False
+    return out
+
+
+def ball_sensitivity(counts):
+    """(src, dst, team, pick) tensor: change in P(team lands pick) when one ball
+    moves from ``src`` to ``dst``. Indices follow ``counts`` (pool order)."""
+    return _sensitivity(tuple(int(c) for c in counts))
+
+
+def largest_change(sensitivity):
+    """(team, pick) absolute change of the single most influential ball move."""
+    return np.abs(sensitivity).max(axis=(0, 1))
@@ -0,0 +1,85 @@
+"""Background warm-up of every state the next ball can lead to.
+
+Which ball comes up only matters through the team that owns it, so the next
+draw has one branch per remaining team: ``after_draw(counts, w)``. While the
+room waits between picks, a worker thread runs the caller's warm-up function
+(pick odds, sensitivity, ...) on each branch, likeliest first. Those functions
+fill the process-wide caches, so the rerun after the ball is submitted is a
+lookup, and a "what if X is drawn" preview can read a branch straight away.
+
+Branches are shared by every session that reaches the same counts, so each one
+is held per ``holder`` (e.g. a session id): ``cancel`` drops only the caller's
+hold, and a queued branch is cancelled once nobody holds it.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .rules import after_draw
+
+MAX_TRACKED = 512
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lottery-speculate")
+_lock = threading.Lock()
+_futures = {}   # (warm's module, warm's name, branch counts) -> Future
+_holders = {}   # same key -> holders still waiting on that Future
+
+
+def branches(counts):
+    """{winner index: ball counts left after that team is drawn}, for every team
+    holding a ball, likeliest winner first."""
+    counts = tuple(int(c) for c in counts)
+    if len(counts) < 2:
+        return {}
+    order = sorted((w for w, c in enumerate(counts) if c > 0), key=lambda w: -counts[w])
+    return {w: tuple(after_draw(counts, w)) for w in order}
+
+
+def _submit(warm, branch, holder):
+    # keyed by name, not identity: a Streamlit rerun redefines the same function
+    key = (warm.__module__, warm.__qualname__, branch)
+    with _lock:
+        future = _futures.get(key)
+        if future is None or future.cancelled():
+            if len(_futures) >= MAX_TRACKED:
+                for k in [k for k, f in _futures.items() if f.done()]:
+                    del _futures[k]
+                    _holders.pop(k, None)
+            future = _futures[key] = _executor.submit(warm, branch)
+        _holders.setdefault(key, set()).add(holder)
+    return future
+
+
+def precompute(counts, warm, holder=None):
+    """Queue ``warm(branch_counts)`` for every branch of ``counts``, held by ``holder``.
+
+    Returns {winner index: Future of warm's result}. Branches already queued or
+    finished (by any session) are shared rather than recomputed.
+    """
+    return {w: _submit(warm, branch, holder) for w, branch in branches(counts).items()}
+
+
+def cancel(futures, keep=(), holder=None):
+    """Release ``holder``'s hold on branches that are no longer reachable (e.g.
+    the state before a ball was drawn); ``keep`` futures stay held. A branch
+    nobody else holds is dropped from the queue; work already running finishes."""
+    drop = set(map(id, futures)) - set(map(id, keep))
+    with _lock:
+        for key, future in _futures.items():
+            if id(future) in drop:
+                held = _holders.get(key, set())
+                held.discard(holder)
+                if not held:
+                    future.cancel()
+
+
+def branch_result(counts, winner, warm, timeout=None, holder=None):
+    """``warm`` of the state after ``counts[winner]`` is drawn, waiting up to
+    ``timeout`` seconds on the background run if it is still going (then
+    TimeoutError, as ``Future.result``)."""
+    return _submit(warm, tuple(after_draw(tuple(counts), winner)), holder).result(timeout)
+
+
+def pending():
+    """How many queued branches have not finished yet."""
+    with _lock:
+        return sum(not f.done() for f in _futures.values())
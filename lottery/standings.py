@@ -0,0 +1,150 @@
+"""Season standings: one cached, validated frame per ``Dynasty{YEAR}.csv``.
+
+A catalog stats its directory on every lookup (cheap) and only re-parses a CSV
+whose mtime or size changed. Parsed frames are kept in memory and pickled next
+to the CSVs (``.cache/``), so a fresh process skips pandas parsing too.
+Catalogs are shared per directory across the whole process.
+"""
+import os
+import pickle
+import re
+import threading
+
+STANDINGS_RE = re.compile(r"^Dynasty(\d{4})\.csv$", re.IGNORECASE)
+RANK_COLUMNS = ("playoff rank", "playoff standings", "rank", "standings")
+CACHE_VERSION = 1
+
+
+def rank_column(columns):
+    """The column holding playoff rank (``Playoff_Rank``, ``Playoff Standings``, ...), or None."""
+    return next((c for c in columns if c.strip().lower().replace("_", " ") in RANK_COLUMNS), None)
+
+
+def load_standings(path):
+    """Parse one standings CSV into Team / MaxPF / Rank, sorted by Rank, or None
+    when it has no recognisable rank column (or cannot be read)."""
+    import pandas as pd   # only parsing needs it; keeps the package import light
+    try:
+        df = pd.read_csv(path, encoding="utf-8-sig")
+        df.columns = [c.strip() for c in df.columns]
+        rank_col = rank_column(df.columns)
+        if rank_col is None or "Team" not in df.columns or "MaxPF" not in df.columns:
+            return None
+        df = df.rename(columns={rank_col: "Rank"})
+        df["Rank"] = pd.to_numeric(df["Rank"], errors="coerce")
+        df["MaxPF"] = pd.to_numeric(df["MaxPF"], errors="coerce")
+        df = df.dropna(subset=["Rank", "MaxPF"])
+        df["Rank"] = df["Rank"].astype(int)
+        df["Team"] = df["Team"].astype(str)
+        return df.sort_values("Rank").reset_index(drop=True)
+    except Exception:
+        return None
+
+
+class StandingsCatalog:
+    """Index of every ``Dynasty{YEAR}.csv`` in one directory."""
+
+    def __init__(self, standings_dir, cache_dir=None):
+        self.standings_dir = standings_dir
+        self.cache_dir = os.path.join(standings_dir, ".cache") if cache_dir is None else cache_dir
+        self._lock = threading.Lock()
+        self._entries = {}   # year -> (signature, frame or None)
+
+    def _scan(self):
+        found = {}
+        try:
+            with os.scandir(self.standings_dir) as it:
+                for entry in it:
+                    m = STANDINGS_RE.match(entry.name)
+                    if m and entry.is_file():
+                        st = entry.stat()
+                        found[int(m.group(1))] = (entry.path, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        return found
+
+    def _cache_path(self, year):
+        return os.path.join(self.cache_dir, f"Dynasty{year}.pkl")
+
+    def _read_cache(self, year, signature):
+        try:
+            with open(self._cache_path(year), "rb") as f:
+                version, cached_sig, frame = pickle.load(f)
+            if version == CACHE_VERSION and cached_sig == signature:
+                return frame
+        except Exception:
+            pass
+        return None
+
+    def _write_cache(self, year, signature, frame):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = self._cache_path(year) + ".tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump((CACHE_VERSION, signature, frame), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._cache_path(year))
+        except OSError:
+            pass                      # read-only checkout: memory cache still works
+
+    def refresh(self):
+        """Re-stat the directory, re-parsing only new or changed files."""
+        found = self._scan()
+        with self._lock:
+            for year in list(self._entries):
+                if year not in found:
+                    del self._entries[year]
+            for year, signature in found.items():
+                cached = self._entries.get(year)
+                if cached and cached[0] == signature:
+                    continue
+                frame = self._read_cache(year, signature)
+                if frame is None:
+                    frame = load_standings(signature[0])
+                    if frame is not None:
+                        self._write_cache(year, signature, frame)
+                self._entries[year] = (signature, frame)
+        return self
+
+    def years(self):
+        self.refresh()
+        return sorted(self._entries)
+
+    def path(self, year):
+        self.refresh()
+        entry = self._entries.get(year)
+        return entry[0][0] if entry else None
+
+    def frame(self, year):
+        """Validated standings for ``year`` (a shared frame; copy before editing)."""
+        self.refresh()
+        entry = self._entries.get(year)
+        return entry[1] if entry else None
+
+    def latest(self):
+        """(year, frame) for the newest season, or (None, None)."""
+        years = self.years()
+        if not years:
+            return None, None
+        return years[-1], self._entries[years[-1]][1]
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(standings_dir):
+    """Process-wide catalog for ``standings_dir``."""
+    key = os.path.abspath(standings_dir)
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = StandingsCatalog(key)
+        return _catalogs[key]
+
+
+def find_latest_standings(standings_dir):
+    """(year, path) of the newest ``Dynasty{YEAR}.csv``, or (None, None)."""
+    catalog = get_catalog(standings_dir)
+    years = catalog.years()
+    if not years:
+        return None, None
+    return years[-1], catalog.path(years[-1])
@@ -0,0 +1,158 @@
+"""Compact, Streamlit-free lottery state driven by the live rules."""
+import base64
+import zlib
+from itertools import count
+
+import numpy as np
+
+from .rng import new_seed, stream
+from .rules import redistribute
+
+# Process-wide stamps, so a (team, revision) pair never repeats across states.
+_stamps = count(1)
+
+
+def assign_owners(counts, rng=None):
+    """Shuffle ball numbers 1..sum(counts) and hand them out in pool order.
+
+    Returns an int8 owner array indexed by ball number (slot 0 is unused and
+    holds -1, as does any ball nobody owns).
+    """
+    rng = np.random.default_rng(rng)
+    counts = np.asarray(counts, dtype=np.int64)
+    if len(counts) > 127:
+        raise ValueError("At most 127 teams are supported.")
+    total = int(counts.sum())
+    owner = np.full(total + 1, -1, dtype=np.int8)
+    owner[rng.permutation(total) + 1] = np.repeat(np.arange(len(counts), dtype=np.int8), counts)
+    return owner
+
+
+class LotteryState:
+    """One live draw: team names in pool order (worst first), an owner array
+    indexed by ball number, per-team ball counts and the picks made so far.
+
+    Drawn balls move by ``method`` (see ``lottery.apportion``; the live rule
+    is ``current``). Ball numbers are shuffled from ``stream(seed, "assign")``; ``seed`` is kept
+    (and journaled) so any setup can be regenerated exactly for an audit. It is
+    None when an explicit ``owner`` array or ``rng`` was passed instead.
+
+    ``balls[t]`` is team t's sorted ball numbers, kept in step with ``owner``
+    by touching only the balls that move (a draw costs O(balls moved + the
+    recipients' lists), never a scan of the pool); ``revision[t]`` changes
+    whenever that list does, so views can cache anything derived from it.
+    """
+
+    __slots__ = ("names", "owner", "counts", "alive", "draft", "balls", "revision", "seed", "method")
+
+    def __init__(self, names, counts, owner=None, rng=None, seed=None, method="current"):
+        self.names = tuple(names)
+        self.method = method
+        self.counts = np.array(list(counts), dtype=np.int64)
+        self.seed = None
+        if owner is not None:
+            self.owner = np.array(owner, dtype=np.int8)
+        elif rng is not None:
+            self.owner = assign_owners(self.counts, rng)
+        else:
+            self.seed = new_seed() if seed is None else int(seed)
+            self.owner = assign_owners(self.counts, stream(self.seed, "assign"))
+        self.alive = np.ones(len(self.names), dtype=bool)
+        self.draft = []
+        held = np.flatnonzero(self.owner >= 0)
+        grouped = held[np.argsort(self.owner[held], kind="stable")]
+        sizes = np.bincount(self.owner[held], minlength=len(self.names))
+        self.balls = [part.tolist() for part in np.split(grouped, np.cumsum(sizes)[:-1])]
+        self.revision = [next(_stamps) for _ in self.names]
+
+    @property
+    def total_balls(self):
+        return len(self.owner) - 1
+
+    @property
+    def complete(self):
+        return len(self.draft) == len(self.names)
+
+    def remaining(self):
+        """Indices of teams still in the pool, in pool order."""
+        return np.flatnonzero(self.alive)
+
+    def distribution(self):
+        """{team name: ball count} for the teams still in the pool."""
+        return {self.names[i]: int(self.counts[i]) for i in self.remaining()}
+
+    def balls_of(self, team):
+        """Sorted ball numbers held by ``team`` (the live list; do not mutate)."""
+        return self.balls[team]
+
+    def fingerprint(self):
+        """CRC-32 of everything a draw depends on (owners, counts, who is left,
+        picks so far): two states with the same fingerprint draw alike. The
+        journal stores it with every draw to refuse draws made from a stale copy."""
+        crc = zlib.crc32(self.owner.tobytes())
+        crc = zlib.crc32(self.counts.tobytes(), crc)
+        crc = zlib.crc32(self.alive.tobytes(), crc)
+        return zlib.crc32(np.asarray(self.draft, dtype=np.int64).tobytes(), crc)
+
+    def draw(self, ball):
+        """Record the team owning ``ball`` as the next pick and hand its balls to
+        the rest of the pool (except on the final pick). Returns the team index.
+        """
+        if not 1 <= ball <= self.total_balls:
+            raise ValueError(f"Invalid ball number. Enter a number between 1 and {self.total_balls}.")
+        winner = int(self.owner[ball])
+        if winner < 0:
+            raise ValueError(f"Ball #{ball} has no owner. This is an error.")
+        self.draft.append(winner)
+        if not self.complete:
+            self.redistribute(winner)
+        return winner
+
+    def snapshot(self):
+        """Plain-JSON copy of the draw: names, counts, who is left, picks so far
+        and the owner array as base64 int8 bytes (one byte per ball)."""
+        return {
+            "names": list(self.names),
+            "counts": self.counts.tolist(),
+            "alive": self.alive.tolist(),
+            "draft": list(self.draft),
+            "owner": base64.b64encode(self.owner.tobytes()).decode("ascii"),
+            "seed": self.seed,
+            "method": self.method,
+        }
+
+    @classmethod
+    def from_snapshot(cls, snap):
+        """Rebuild a state written by ``snapshot``; ball lists are regrouped from
+        the owner array in one vectorized pass."""
+        owner = np.frombuffer(base64.b64decode(snap["owner"]), dtype=np.int8)
+        state = cls(snap["names"], snap["counts"], owner=owner, method=snap.get("method", "current"))
+        state.alive = np.array(snap["alive"], dtype=bool)
+        state.draft = [int(t) for t in snap["draft"]]
+        state.seed = snap.get("seed")
+        return state
+
+    def redistribute(self, winner):
+        """Drop ``winner`` from the pool and move its balls by the live rules."""
+        pool = self.remaining()
+        extra = redistribute(self.counts[pool].tolist(), int(np.searchsorted(pool, winner)), self.method)
+        others = pool[pool != winner]
+        self.alive[winner] = False
+        if self.counts[others].sum() <= 0:
+            return                                   # nobody to receive: balls stay put
+        balls = self.balls[winner]
+        self.balls[winner] = []
+        self.revision[winner] = next(_stamps)
+        start = 0
+        for t, n in zip(others.tolist(), extra):
+            if n <= 0:
+                continue
+            moved = balls[start:start + n]
+            start += n
+            self.owner[moved] = t
+            held = self.balls[t]
+            held.extend(moved)
+            held.sort()                              # two sorted runs: a linear merge
+            self.revision[t] = next(_stamps)
+        self.counts[others] += extra
+        self.counts[winner] = 0
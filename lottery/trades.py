@@ -0,0 +1,149 @@
+"""Score proposed ball trades between lottery teams.
+
+A trade moves whole balls between lottery teams before the draw ("10 of my
+balls for your 2nd-rounder"); whatever changes hands outside the lottery is the
+league's to weigh. Each scenario is scored with ``replay.pick_odds`` under the
+live whole-ball rules: exact up to ``formats.EXACT_MAX_TEAMS`` teams, seeded
+replay above. Scenarios are deduplicated by their ball counts; exact ones are
+solved together with ``exact.pick_probabilities_batch`` (traded pools share
+few sub-states, so a breadth-first batch beats the memoized recursion) and
+kept in a process-wide LRU, so re-scoring a sweep or its neighbours is a lookup.
+
+Trades are short strings, teams by name or worst-first number as in
+``optimize``::
+
+    "Phil -> Sherman 10"                 Phil gives Sherman 10 balls
+    "team6 -> team1 10, team1 -> team3 2"  several transfers in one deal
+"""
+import re
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from .exact import pick_probabilities_batch
+from .formats import EXACT_MAX_TEAMS
+from .replay import pick_odds
+
+Transfer = namedtuple("Transfer", "giver receiver balls")
+Trade = namedtuple("Trade", "label transfers")
+
+BATCH_SIZE = 128        # count vectors per breadth-first exact solve
+MAX_SOLVED = 16384      # exact matrices kept across calls
+_solved = OrderedDict()
+
+_TRANSFER_RE = re.compile(r"^\s*(.+?)\s*->\s*(.+?)\s+(\d+)\s*(?:balls?)?\s*$", re.IGNORECASE)
+
+
+def _team(token, names):
+    m = re.fullmatch(r"team\s*(\d+)", token, re.IGNORECASE)
+    if m and 1 <= int(m.group(1)) <= len(names):
+        return int(m.group(1)) - 1
+    if token not in names:
+        raise ValueError(f"Unknown lottery team {token!r}.")
+    return names.index(token)
+
+
+def parse_trade(text, names):
+    """``"Phil -> Sherman 10, ..."`` -> Trade(label=text, transfers=(Transfer(5, 0, 10), ...))."""
+    transfers = []
+    for part in re.split(r"[,;]", text):
+        m = _TRANSFER_RE.match(part)
+        if not m:
+            raise ValueError(f"Cannot parse trade {text!r}; expected e.g. 'Phil -> Sherman 10'.")
+        giver, receiver = _team(m.group(1), names), _team(m.group(2), names)
+        if giver == receiver:
+            raise ValueError(f"{part.strip()!r} trades with itself.")
+        transfers.append(Transfer(giver, receiver, int(m.group(3))))
+    return Trade(text.strip(), tuple(transfers))
+
+
+def apply_trade(counts, trade):
+    """Ball counts after ``trade``; every lottery team must keep at least one ball."""
+    moved = list(counts)
+    for t in trade.transfers:
+        moved[t.giver] -= t.balls
+        moved[t.receiver] += t.balls
+    if min(moved) < 1:
+        raise ValueError(f"{trade.label!r} leaves a team without a ball: {moved}.")
+    return tuple(moved)
+
+
+def transfer_sweep(counts, max_balls=None, step=1):
+    """Every single transfer of ``step``..``max_balls`` balls between two teams."""
+    n = len(counts)
+    for giver in range(n):
+        top = counts[giver] - 1 if max_balls is None else min(max_balls, counts[giver] - 1)
+        for receiver in range(n):
+            if receiver == giver:
+                continue
+            for balls in range(step, top + 1, step):
+                yield Trade(f"team{giver + 1} -> team{receiver + 1} {balls}",
+                            (Transfer(giver, receiver, balls),))
+
+
+def solve(count_list, method="current", exact_max_teams=EXACT_MAX_TEAMS, seed=0):
+    """{counts: (matrix, exact)} for distinct count tuples, exact ones in batches."""
+    found, todo = {}, []
+    for c in count_list:
+        if (c, method) in _solved:
+            _solved.move_to_end((c, method))
+            found[c] = _solved[(c, method)], True
+        elif len(c) <= exact_max_teams:
+            todo.append(c)
+        else:
+            found[c] = pick_odds(c, exact_max_teams, seed=seed, method=method)
+    for i in range(0, len(todo), BATCH_SIZE):
+        chunk = todo[i:i + BATCH_SIZE]
+        for c, matrix in zip(chunk, pick_probabilities_batch(chunk, method)):
+            matrix.flags.writeable = False
+            _solved[(c, method)] = matrix
+            found[c] = matrix, True
+    while len(_solved) > MAX_SOLVED:
+        _solved.popitem(last=False)
+    return found
+
+
+def evaluate_trades(counts, trades, names=None, rank_by=None, method="current",
+                    exact_max_teams=EXACT_MAX_TEAMS, seed=0):
+    """Score every trade against the untraded ``counts`` and return results ranked.
+
+    ``trades`` are Trade tuples or strings (parsed against ``names``). Each result
+    holds the new counts, the team x pick matrix, ``expected_pick`` per team and
+    ``gain`` (baseline minus new expected pick, so positive = a better pick).
+    Results are ordered by ``gain`` of ``rank_by`` (a team index or name), or by
+    the largest gain any team gets when ``rank_by`` is None. Trades that leave a
+    team ballless are skipped.
+    """
+    counts = tuple(int(c) for c in counts)
+    names = list(names) if names is not None else [f"team{i + 1}" for i in range(len(counts))]
+    if isinstance(rank_by, str):
+        rank_by = _team(rank_by, names)
+    trades = [parse_trade(t, names) if isinstance(t, str) else t for t in trades]
+    moved = []
+    for trade in trades:
+        try:
+            moved.append(apply_trade(counts, trade))
+        except ValueError:
+            moved.append(None)
+    scored = solve(sorted({c for c in moved if c is not None} | {counts}), method, exact_max_teams, seed)
+    picks = np.arange(1, len(counts) + 1)
+    base_expected = scored[counts][0] @ picks
+    results = []
+    for trade, c in zip(trades, moved):
+        if c is None:
+            continue
+        matrix, exact = scored[c]
+        expected = matrix @ picks
+        gain = base_expected - expected
+        results.append({
+            "trade": trade.label,
+            "transfers": trade.transfers,
+            "counts": c,
+            "matrix": matrix,
+            "exact": exact,
+            "expected_pick": expected,
+            "gain": gain,
+            "score": float(gain.max() if rank_by is None else gain[rank_by]),
+        })
+    results.sort(key=lambda r: -r["score"])
+    return results
@@ -1,6 +1,27 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lottery.montecarlo import PickTally, order_batches
+from lottery.replay import compare_methods
+from lottery.rng import new_seed, stream
+from lottery.rules import exp_probs
+
+# Derived odds, ball tables and simulation results are cached on the
+# normalized odds, so scrubbing back to a setting is a lookup. Odds closer than
+# ODDS_DECIMALS share an entry; recomputation waits until the controls have
+# been still for DEBOUNCE_SECONDS. Simulations stream in batches and the
+# results redraw at most every UPDATE_SECONDS.
+CACHE_ENTRIES = 128
+ODDS_DECIMALS = 9
+DEBOUNCE_SECONDS = 0.4
+UPDATE_SECONDS = 0.25
 
 # Function to load CSV file
 @st.cache_data
@@ -8,24 +29,129 @@ def load_data(file_path='Dynasty2024.csv'):
     data = pd.read_csv(file_path)
     return data
 
-# Function to simulate lottery
-def simulate_lottery(data, odds, num_simulations=10):
-    lottery_teams = data[data['Playoff_Rank'] > (12 - len(odds))].sort_values('MaxPF')
-    num_lottery_teams = len(lottery_teams)
-    
-    results = []
-    for _ in range(num_simulations):
-        lottery_order = np.random.choice(range(num_lottery_teams), size=num_lottery_teams, replace=False, p=odds)
-        draft_order = [lottery_teams.index[i] for i in lottery_order]
-        draft_order += list(data[data['Playoff_Rank'] <= (12 - len(odds))].sort_values('Playoff_Rank', ascending=False).index)
-        results.append(draft_order)
-    
-    return results
-
-# Function to calculate exponential odds
-def calculate_exp_odds(exp_base, num_teams):
-    odds = [exp_base ** (num_teams - i) for i in range(num_teams)]
-    return [o / sum(odds) for o in odds]
+def odds_key(odds):
+    """Odds normalized to sum to 1 and rounded, as a hashable cache key."""
+    total = sum(odds)
+    return tuple(round(o / total, ODDS_DECIMALS) for o in odds)
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def lottery_pool(num_lottery_teams):
+    """Non-playoff teams sorted by MaxPF (team 1 = lowest) for a lottery size."""
+    data = load_data()
+    return data[data['Playoff_Rank'] > (len(data) - num_lottery_teams)].sort_values('MaxPF')
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def derived_odds(slider_odds, boost_position, boost_amount):
+    """Slider odds plus the consolation boost (position None = no boost), normalized."""
+    odds = list(slider_odds)
+    if boost_position is not None:
+        odds[boost_position] += boost_amount
+    return odds_key(odds)
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def ball_distribution(odds, total_balls):
+    """Round odds to whole balls, then move balls one at a time until the pool adds up."""
+    balls = [round(odd * total_balls) for odd in odds]
+    while sum(balls) != total_balls:
+        if sum(balls) > total_balls:
+            balls[np.argmax(balls)] -= 1
+        else:
+            balls[np.argmin(balls)] += 1
+    return balls
+
+@st.cache_data(max_entries=CACHE_ENTRIES)
+def method_comparison(odds, total_balls):
+    return compare_methods([o * 100 for o in odds], total_balls, num_sims=20_000)
+
+@st.cache_resource
+def finished_runs():
+    """Completed runs, (tally, sample orders) by setting, least recently used
+    first, and the lock every session must hold to touch them."""
+    return OrderedDict(), threading.Lock()
+
+def nudged():
+    """on_change for every control: restarts the debounce window."""
+    st.session_state.nudged_at = time.monotonic()
+
+def settling():
+    return time.monotonic() - st.session_state.get('nudged_at', 0.0) < DEBOUNCE_SECONDS
+
+def draw_results(tally, samples, lottery_teams, playoff_names):
+    """Running aggregate: pick odds, per-team pick stats and a few sample drafts."""
+    stats = tally.summary()
+    teams = lottery_teams['Team']
+    st.caption(f"{tally.sims:,} simulations · pick odds within "
+               f"±{(stats['probs_high'] - stats['probs']).max():.2%} (95%)")
+
+    # Pick-position probabilities over every simulation so far
+    st.dataframe(pd.DataFrame(stats['probs'], index=teams,
+                              columns=[f"Pick {k+1}" for k in range(len(teams))]).style.format("{:.2%}"))
+
+    st.dataframe(pd.DataFrame({
+        "Mean pick": stats['mean'],
+        "95% CI": [f"{lo:.2f} – {hi:.2f}" for lo, hi in zip(stats['mean_low'], stats['mean_high'])],
+        "Median pick": stats['p50'],
+        "10th – 90th pct": [f"{lo} – {hi}" for lo, hi in zip(stats['p10'], stats['p90'])],
+    }, index=teams).style.format({"Mean pick": "{:.2f}"}))
+
+    st.markdown("**Sample drafts**")
+    st.dataframe(pd.DataFrame([list(teams.iloc[order]) + playoff_names for order in samples],
+                              index=[f"Simulation {i+1}" for i in range(len(samples))],
+                              columns=[f"Pick {k+1}" for k in range(len(teams) + len(playoff_names))]))
+
+def render_simulation(key):
+    """Run ``key``'s simulations in fixed-size batches, redrawing the running
+    aggregate at most every UPDATE_SECONDS; finished runs come from the LRU."""
+    odds, num_simulations, seed = key
+    data = load_data()
+    lottery_teams = lottery_pool(len(odds))
+    playoff_names = list(data[data['Playoff_Rank'] <= (len(data) - len(odds))].sort_values('Playoff_Rank', ascending=False)['Team'])
+
+    st.subheader("Simulation Results")
+    progress = st.empty()
+    results = st.empty()
+    runs, runs_lock = finished_runs()
+    with runs_lock:
+        finished = runs.get(key)
+        if finished is not None:
+            runs.move_to_end(key)
+    if finished is not None:
+        with results.container():
+            draw_results(*finished, lottery_teams, playoff_names)
+        return
+
+    tally = PickTally(len(odds))
+    samples = None
+    drawn_at = 0.0
+    for orders in order_batches(odds, num_simulations, stream(seed, "simulator")):
+        tally.add(orders)
+        if samples is None:
+            samples = orders[:10].copy()
+        if tally.sims == num_simulations or time.monotonic() - drawn_at >= UPDATE_SECONDS:
+            progress.progress(tally.sims / num_simulations,
+                              text=f"{tally.sims:,} of {num_simulations:,} simulations")
+            with results.container():
+                draw_results(tally, samples, lottery_teams, playoff_names)
+            drawn_at = time.monotonic()
+    progress.empty()
+    with runs_lock:
+        runs[key] = (tally, samples)
+        while len(runs) > CACHE_ENTRIES:
+            runs.popitem(last=False)
+
+def simulation_results(key, waiting):
+    """Results for ``key``; while the controls are settling, the last shown
+    results stay up and a timer picks up the new setting once they are still."""
+    if settling():
+        shown = st.session_state.get('shown_key')
+        if shown is not None:
+            st.caption("Updating once the controls settle…")
+            render_simulation(shown)
+        return
+    if waiting:
+        st.rerun()                       # settled: a full run draws the new setting and drops the timer
+    render_simulation(key)
+    st.session_state.shown_key = key
 
 # Streamlit app
 st.title('Dynasty Fantasy Football Draft Lottery Simulator')
@@ -38,38 +164,41 @@ st.subheader("Input Data")
 st.dataframe(data)
 
 # Select number of lottery teams
-num_lottery_teams = st.radio("Number of teams in lottery", (6, 8))
+num_lottery_teams = st.radio("Number of teams in lottery", [n for n in (6, 8, 10, 12, 16) if n < len(data)],
+                             on_change=nudged)
 
 # Get lottery teams sorted by MaxPF
-lottery_teams = data[data['Playoff_Rank'] > (12 - num_lottery_teams)].sort_values('MaxPF')
+lottery_teams = lottery_pool(num_lottery_teams)
 
 # Adjust lottery odds
 st.subheader("Adjust Lottery Odds")
 
 # Add slider for exp_base
-exp_base = st.slider("Adjust initial odds distribution (higher value = steeper curve)", 1.1, 3.0, 1.5, 0.1)
+exp_base = st.slider("Adjust initial odds distribution (higher value = steeper curve)", 1.1, 3.0, 1.5, 0.1,
+                     on_change=nudged)
 
 # Calculate initial exponential odds
-initial_odds = calculate_exp_odds(exp_base, num_lottery_teams)
+initial_odds = [p / 100 for p in exp_probs(exp_base, num_lottery_teams)]
 
 st.write(f"Adjust the odds for each non-playoff team. Team 1 has the lowest MaxPF, Team {num_lottery_teams} has the highest.")
 
-odds = []
+slider_odds = []
 for i in range(num_lottery_teams):
-    odds.append(st.slider(f"Team {i+1} (Relative MaxPF Rank: {i+1})", 0.0, 1.0, initial_odds[i], 0.01))
+    slider_odds.append(st.slider(f"Team {i+1} (Relative MaxPF Rank: {i+1})", 0.0, 1.0, initial_odds[i], 0.01,
+                                 on_change=nudged))
 
 # Consolation bracket winner boost
-include_boost = st.radio("Include consolation bracket winner boost?", ('Yes', 'No'))
-boost_amount = st.slider("Consolation winner odds boost", 0.0, 0.2, 0.05, 0.01)
+include_boost = st.radio("Include consolation bracket winner boost?", ('Yes', 'No'), on_change=nudged)
+boost_amount = st.slider("Consolation winner odds boost", 0.0, 0.2, 0.05, 0.01, on_change=nudged)
 
 # Apply consolation bracket winner boost if selected
+consolation_winner_position = None
 if include_boost == 'Yes':
     consolation_winner_index = lottery_teams[lottery_teams['Playoff_Rank'] == 7].index[0]
     consolation_winner_position = lottery_teams.index.get_loc(consolation_winner_index)
-    odds[consolation_winner_position] += boost_amount
 
 # Normalize odds
-odds = [o / sum(odds) for o in odds]
+odds = derived_odds(tuple(slider_odds), consolation_winner_position, boost_amount)
 
 # Create two columns for normalized odds and odds distribution
 col1, col2 = st.columns(2)
@@ -80,7 +209,7 @@ with col1:
     for i, odd in enumerate(odds):
         team_name = lottery_teams.iloc[i]['Team']
         st.write(f"Team {i+1} ({team_name}): {odd:.2%}")
-        if include_boost == 'Yes' and i == consolation_winner_position:
+        if i == consolation_winner_position:
             st.write("(Includes consolation winner boost)")
 
 # Display odds distribution
@@ -92,39 +221,36 @@ with col2:
     })
     st.bar_chart(chart_data.set_index('Team'))
 
-st.subheader("Lottery Ball Distribution (200 balls total)")
-ball_distribution = [round(odd * 200) for odd in odds]
-
-# Adjust to ensure total is 100
-while sum(ball_distribution) != 200:
-    if sum(ball_distribution) > 200:
-        ball_distribution[np.argmax(ball_distribution)] -= 1
-    else:
-        ball_distribution[np.argmin(ball_distribution)] += 1
-
-for i, balls in enumerate(ball_distribution):
+total_balls = int(st.number_input("Total balls", 100, 20_000, 200, step=100, on_change=nudged))
+st.subheader(f"Lottery Ball Distribution ({total_balls} balls total)")
+for i, balls in enumerate(ball_distribution(odds, total_balls)):
     team_name = lottery_teams.iloc[i]['Team']
     st.write(f"Team {i+1} ({team_name}): {balls} balls")
 
-# Simulate lottery
-if st.button("Run Simulation"):
-    simulations = simulate_lottery(data, odds)
-    
-    st.subheader("Simulation Results")
-    
-    # Create two rows of five columns each
-    row1 = st.columns(5)
-    row2 = st.columns(5)
-    
-    for i, result in enumerate(simulations, 1):
-        # Determine which row and column to use
-        col = row1[i-1] if i <= 5 else row2[i-6]
-        
-        with col:
-            st.write(f"Simulation {i}:")
-            for pick, team_index in enumerate(result, 1):
-                st.write(f"Pick {pick}: {data.loc[team_index, 'Team']} (MaxPF: {data.loc[team_index, 'MaxPF']})")
-            st.write("---")
+# Compare how each rounding method bends the odds at this pool size
+if st.checkbox("Compare ball rounding methods"):
+    st.caption("Each method sets the starting balls and splits a drawn team's balls among the rest. "
+               "Distortion is how far the real pick odds land from the odds above (percentage points).")
+    methods = method_comparison(odds, total_balls)
+    st.dataframe(pd.DataFrame([{
+        "Method": r["method"],
+        "Balls (team 1 first)": ", ".join(map(str, r["counts"])),
+        "Pick 1 error (pp)": r["initial_error"] * 100,
+        "Max distortion (pp)": r["max_abs_distortion"] * 100,
+        "Mean distortion (pp)": r["mean_abs_distortion"] * 100,
+        "Exact": r["exact"],
+    } for r in methods]).style.format(precision=2), hide_index=True)
 
+# Simulate lottery
+num_simulations = st.number_input("Number of simulations", 10, 5_000_000, 100_000, step=10_000, on_change=nudged)
+seed = st.number_input("Random seed (same seed, same results)", 0, 2**48 - 1,
+                       st.session_state.setdefault('default_seed', new_seed()), on_change=nudged)
 
+# Once run, results follow the controls (cached per setting, debounced while they move)
+if st.button("Run Simulation"):
+    st.session_state.simulating = True
 
+if st.session_state.get('simulating'):
+    waiting = settling()
+    st.fragment(run_every=DEBOUNCE_SECONDS if waiting else None)(simulation_results)(
+        (odds, int(num_simulations), int(seed)), waiting)
@@ -1,23 +1,82 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import random
-import re
-import glob
+import altair as alt
+import functools
 import os
+import re
+import uuid
 import json
 import streamlit.components.v1 as components
 
+from assets import asset_url, font_css, sound_urls, use_local
+from lottery import (
+    LotteryState, initial_counts, pick_odds, ball_sensitivity, largest_change, get_catalog,
+    DEFAULT_LEAGUE, list_leagues, resolve_league, NULL_TRACER, RerunTracer,
+    LEAGUE_FORMATS, DEFAULT_FORMAT, EXACT_MAX_TEAMS, get_format, DrawJournal, StaleDraw,
+    precompute, cancel_branches, get_channel,
+)
+
 # ── Page config (must be first Streamlit call) ────────────────────────────────
 st.set_page_config(layout="wide", page_title="Dynasty Draft Lottery", page_icon="🏈")
 
 # ── Constants ─────────────────────────────────────────────────────────────────
-TOTAL_BALLS = 200
-LOTTERY_TEAMS_COUNT = 6
-PLAYOFF_TEAMS_COUNT = 6
-INITIAL_PROBS = [71.98, 16.17, 8.00, 2.67, 0.89, 0.30]
+# League size comes from ?size=<teams> (see lottery.formats); classic 12 by default.
+FORMAT_KEY = st.query_params.get("size") if st.query_params.get("size") in LEAGUE_FORMATS else DEFAULT_FORMAT
+FORMAT = get_format(FORMAT_KEY)
+LOTTERY_TEAMS_COUNT = FORMAT.teams - FORMAT.playoff_teams
+PLAYOFF_TEAMS_COUNT = FORMAT.playoff_teams
+BALL_LIST_INLINE = 400       # bigger pools list one team's balls at a time
+SENSITIVITY_EAGER_TEAMS = 6  # bigger pools compute the sensitivity heatmap on request
+SPECTATOR_POLL = "1s"        # how often a spectator checks the broadcast for a new event
 STANDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Standings")
+LEAGUES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Leagues")
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Journals")
+DRAW_ID_RE = re.compile(r"[0-9a-f]{12}")
+JOURNAL_META = ("lottery_teams", "playoff_teams", "consolation_winner", "consolation_applied", "standings_year")
 CHIP_COLORS = ["#FFB627", "#4ECDC4", "#45B7D1", "#96CEB4", "#F7B2BD", "#C5A8FF"]
+LOCAL_ASSETS = use_local()   # serve confetti/audio/fonts from static/ when the bundle is present
+PROFILING = st.query_params.get("profile") == "1" or os.environ.get("LOTTERY_PROFILE") == "1"
+
+
+# ── Profiling (opt-in: ?profile=1 or LOTTERY_PROFILE=1) ──────────────────────
+def tracer():
+    """This session's RerunTracer when profiling is on, else a no-op tracer."""
+    return st.session_state.get("tracer", NULL_TRACER) if PROFILING else NULL_TRACER
+
+
+def traced(name):
+    """Run a renderer inside a tracer section (its own run on a fragment rerun)."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer().section(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def send_html(name, body, **kwargs):
+    """components.html, with the iframe payload size recorded when profiling."""
+    tracer().payload(name, body)
+    components.html(body, **kwargs)
+
+
+def send_markdown(name, body):
+    """st.markdown of raw HTML, with the payload size recorded when profiling."""
+    tracer().payload(name, body)
+    st.markdown(body, unsafe_allow_html=True)
+
+
+def send_table(name, frame):
+    """st.table, with the table's size (as JSON, close to what is sent) recorded when profiling."""
+    if tracer().enabled:
+        tracer().payload(name, frame.to_json(orient="split"))
+    st.table(frame)
+
+
+if PROFILING and "tracer" not in st.session_state:
+    st.session_state.tracer = RerunTracer()
+tracer().begin("full run")
 
 
 def american_odds(pct):
@@ -34,10 +93,8 @@ def american_odds(pct):
     return f"{val:+.0f}"
 
 # ── Custom CSS ────────────────────────────────────────────────────────────────
-st.markdown("""
+APP_CSS = """
 <style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');
-
 html, body, [class*="css"] { font-family: 'Inter', sans-serif; }
 
 /* ── Hero banner ── */
@@ -270,113 +327,37 @@ div[data-testid="stButton"] > button[data-testid="stBaseButton-secondary"] {
     overflow: hidden !important;
 }
 </style>
-""", unsafe_allow_html=True)
-
-
-# ── Celebration effects (canvas-confetti CDN + real audio samples, all client-side) ──
-def celebrate_winner(drawn_ball, candidates, winner_name):
-    """Per-pick celebration: drum-roll sample (1.2s) → airhorn + cymbal + cheer + confetti + sparks.
-    Slot machine cycles through candidate names during the roll, locks to winner_name at reveal.
-    Streamlit serves on localhost so the iframe can access window.parent."""
-    candidates_js = json.dumps(candidates if candidates else [winner_name])
-    winner_js = json.dumps(winner_name)
-    components.html(
+"""
+with tracer().section("css"):
+    font_style = f"<style>\n{font_css(LOCAL_ASSETS)}</style>"
+    send_markdown("font", font_style)
+    send_markdown("css", APP_CSS)
+
+
+# ── Celebration effects (canvas-confetti + real audio samples, all client-side) ──
+# Samples are fetched and decoded once per browser tab into Web Audio buffers kept
+# on window.parent, so every pick replays the same buffers with no network wait.
+# The effects live in one long-lived component (components/celebration) that
+# loads once per draw and is sent small events; the engine file is shared with
+# the preloader below, which falls back to plain <audio> until buffers are ready.
+CELEBRATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "celebration")
+with open(os.path.join(CELEBRATION_DIR, "audio.js"), encoding="utf-8") as _f:
+    AUDIO_ENGINE_JS = _f.read()
+CELEBRATION = components.declare_component("celebration", path=CELEBRATION_DIR)
+CELEBRATION_EVENTS_KEPT = 2   # a last pick and the finale can land in the same run
+
+
+def audio_preload():
+    """Zero-height iframe that warms the decoded-audio cache. Identical on every
+    run, so Streamlit keeps the same iframe instead of reloading it."""
+    send_html(
+        "audio_preload",
         f"""
-        <script src="https://cdn.jsdelivr.net/npm/canvas-confetti@1.9.3/dist/confetti.browser.min.js"></script>
         <script>
         (function() {{
-            var CANDIDATES = {candidates_js};
-            var WINNER = {winner_js};
-
-            // ── Audio (real samples from Google Actions Sound Library) ─────────
-            try {{
-                var ROLL  = new Audio('https://actions.google.com/sounds/v1/cartoon/drum_roll.ogg');
-                var HORN  = new Audio('https://actions.google.com/sounds/v1/transportation/air_horn_in_close_hall_series.ogg');
-                var CRASH = new Audio('https://actions.google.com/sounds/v1/cartoon/crash_layer_cymbals.ogg');
-                var CHEER = new Audio('https://actions.google.com/sounds/v1/crowds/team_cheer.ogg');
-                ROLL.volume = 0.9; HORN.volume = 1.0; CRASH.volume = 0.8; CHEER.volume = 0.6;
-
-                ROLL.play().catch(function() {{}});
-
-                setTimeout(function() {{
-                    try {{ ROLL.pause(); ROLL.currentTime = 0; }} catch(_) {{}}
-                }}, 1180);
-                setTimeout(function() {{
-                    HORN.play().catch(function() {{}});
-                    CRASH.play().catch(function() {{}});
-                    CHEER.play().catch(function() {{}});
-                    setTimeout(function() {{
-                        try {{ HORN.pause();  HORN.currentTime  = 0; }} catch(_) {{}}
-                        try {{ CHEER.pause(); CHEER.currentTime = 0; }} catch(_) {{}}
-                    }}, 15000);
-                }}, 1200);
-            }} catch(audioErr) {{}}
-
-            // ── Slot-machine name cycling (setInterval so names are readable) ──
-            var span = window.parent.document.getElementById('lottery-ball-spin');
-            var idx = 0;
-            var spinTimer = null;
-            if (span && CANDIDATES.length > 0) {{
-                spinTimer = setInterval(function() {{
-                    span.textContent = CANDIDATES[idx % CANDIDATES.length];
-                    idx++;
-                }}, 100);
-            }}
-
-            setTimeout(function() {{
-                if (spinTimer) clearInterval(spinTimer);
-                if (span) {{
-                    span.textContent = WINNER;
-                    span.classList.add('locked');
-                }}
-            }}, 1180);
-
-            // ── Visuals at 1200ms (synced with airhorn) ────────────────────
-            setTimeout(function() {{
-                try {{
-                    var confCanvas = window.parent.document.createElement('canvas');
-                    confCanvas.style.cssText =
-                        'position:fixed;top:0;left:0;width:100%;height:100%;'
-                        + 'pointer-events:none;z-index:99999;';
-                    window.parent.document.body.appendChild(confCanvas);
-                    var burst = confetti.create(confCanvas, {{ resize: true, useWorker: true }});
-                    burst({{
-                        particleCount: 220,
-                        spread: 110,
-                        origin: {{ y: 0.22 }},
-                        colors: ['#FFB627', '#F2F4FA', '#4ECDC4', '#45B7D1', '#f5a000'],
-                        ticks: 320,
-                    }});
-                    setTimeout(function() {{ confCanvas.remove(); }}, 6000);
-
-                    var sparksCanvas = window.parent.document.createElement('canvas');
-                    sparksCanvas.style.cssText =
-                        'position:fixed;top:0;left:0;width:100%;height:100%;'
-                        + 'pointer-events:none;z-index:99998;';
-                    window.parent.document.body.appendChild(sparksCanvas);
-                    var sparkBurst = confetti.create(sparksCanvas, {{ resize: true, useWorker: false }});
-                    var sparkEnd = Date.now() + 3000;
-                    (function sparkFrame() {{
-                        sparkBurst({{
-                            particleCount: 5, angle: 75, spread: 22, startVelocity: 65,
-                            origin: {{ x: 0, y: 1 }},
-                            colors: ['#FFB627', '#FFE082', '#FFFFFF', '#f5a000'],
-                            scalar: 0.65, gravity: 1.2, ticks: 220,
-                        }});
-                        sparkBurst({{
-                            particleCount: 5, angle: 105, spread: 22, startVelocity: 65,
-                            origin: {{ x: 1, y: 1 }},
-                            colors: ['#FFB627', '#FFE082', '#FFFFFF', '#f5a000'],
-                            scalar: 0.65, gravity: 1.2, ticks: 220,
-                        }});
-                        if (Date.now() < sparkEnd) {{
-                            requestAnimationFrame(sparkFrame);
-                        }} else {{
-                            setTimeout(function() {{ sparksCanvas.remove(); }}, 2000);
-                        }}
-                    }})();
-                }} catch(visErr) {{}}
-            }}, 1200);
+            var SOUND_URLS = {json.dumps(sound_urls(LOCAL_ASSETS))};
+            {AUDIO_ENGINE_JS}
+            loadSounds();
         }})();
         </script>
         """,
@@ -384,87 +365,29 @@ def celebrate_winner(drawn_ball, candidates, winner_name):
     )
 
 
-def fire_fireworks_barrage():
-    """8-second fireworks show for the final draft order reveal."""
-    components.html(
-        """
-        <script src="https://cdn.jsdelivr.net/npm/canvas-confetti@1.9.3/dist/confetti.browser.min.js"></script>
-        <script>
-        (function() {
-            try {
-                var fwCanvas = window.parent.document.createElement('canvas');
-                fwCanvas.style.cssText =
-                    'position:fixed;top:0;left:0;width:100%;height:100%;'
-                    + 'pointer-events:none;z-index:99999;';
-                window.parent.document.body.appendChild(fwCanvas);
-                var fwBurst = confetti.create(fwCanvas, { resize: true, useWorker: true });
-
-                function rnd(min, max) { return Math.random() * (max - min) + min; }
-
-                var duration = 8000;
-                var animEnd  = Date.now() + duration;
-                var colors   = ['#FFB627','#F2F4FA','#4ECDC4','#FF6B6B','#C5A8FF','#f5a000'];
-
-                var interval = setInterval(function() {
-                    var timeLeft = animEnd - Date.now();
-                    if (timeLeft <= 0) {
-                        clearInterval(interval);
-                        setTimeout(function() { fwCanvas.remove(); }, 2000);
-                        return;
-                    }
-                    var pc = Math.max(10, Math.floor(55 * (timeLeft / duration)));
-                    fwBurst({
-                        particleCount: pc,
-                        startVelocity: rnd(22, 38),
-                        spread: 360, ticks: 80,
-                        origin: { x: rnd(0.1, 0.3), y: rnd(-0.1, 0.15) },
-                        colors: colors,
-                    });
-                    fwBurst({
-                        particleCount: pc,
-                        startVelocity: rnd(22, 38),
-                        spread: 360, ticks: 80,
-                        origin: { x: rnd(0.7, 0.9), y: rnd(-0.1, 0.15) },
-                        colors: colors,
-                    });
-                }, 250);
-            } catch(e) { /* ignore */ }
-        })();
-        </script>
-        """,
-        height=0,
-    )
+def celebrate(kind, **details):
+    """Queue a celebration event ('pick' or 'finale') for the component."""
+    events = st.session_state.get('celebrations', [])
+    events.append({"id": uuid.uuid4().hex, "kind": kind, **details})
+    st.session_state.celebrations = events[-CELEBRATION_EVENTS_KEPT:]
 
 
-# ── CSV helpers ───────────────────────────────────────────────────────────────
-def find_latest_standings(standings_dir=STANDINGS_DIR):
-    pattern = re.compile(r"Dynasty(\d{4})\.csv$", re.IGNORECASE)
-    candidates = []
-    for path in glob.glob(os.path.join(standings_dir, "*.csv")):
-        m = pattern.search(os.path.basename(path))
-        if m:
-            candidates.append((int(m.group(1)), path))
-    if not candidates:
-        return None, None
-    return max(candidates, key=lambda x: x[0])
+def celebration_measured():
+    st.session_state.celebration_rerun = True
 
 
-def load_standings(path):
-    try:
-        df = pd.read_csv(path)
-        rank_col = next(
-            (c for c in df.columns
-             if c.strip().lower().replace("_", " ")
-             in ("playoff rank", "playoff standings", "rank", "standings")),
-            None,
-        )
-        if rank_col is None:
-            return None
-        df = df.rename(columns={rank_col: "Rank"})
-        df["Rank"] = pd.to_numeric(df["Rank"], errors="coerce")
-        return df.dropna(subset=["Rank"]).sort_values("Rank")
-    except Exception:
-        return None
+def celebration():
+    """The celebration component, at a fixed spot so every rerun updates the same
+    frame. It plays events it has not seen and reports the frame rate it measured."""
+    events = st.session_state.get('celebrations', [])
+    tracer().payload("celebration", json.dumps(events))
+    CELEBRATION(
+        events=events,
+        assets={"confetti": asset_url('confetti.browser.min.js', LOCAL_ASSETS), "sounds": sound_urls(LOCAL_ASSETS)},
+        key="celebration",
+        default=None,
+        on_change=celebration_measured,
+    )
 
 
 # ── Core lottery logic ────────────────────────────────────────────────────────
@@ -475,25 +398,12 @@ def calculate_initial_distribution():
             st.session_state.error_message = f"Please enter names for all {LOTTERY_TEAMS_COUNT} lottery teams."
             return
         sorted_teams = sorted(valid_teams, key=lambda x: x['max_pf'])
-        distribution = {}
-        total_assigned = 0
-        for i, team in enumerate(sorted_teams):
-            num_balls = round(TOTAL_BALLS * INITIAL_PROBS[i] / 100)
-            distribution[team['name']] = int(num_balls)
-            total_assigned += int(num_balls)
-        if total_assigned != TOTAL_BALLS:
-            distribution[sorted_teams[0]['name']] += TOTAL_BALLS - total_assigned
+        names = [team['name'] for team in sorted_teams]
         winner = st.session_state.get('consolation_winner')
-        if winner and winner in distribution:
-            donor = max(distribution, key=lambda t: distribution[t])          # most balls
-            if donor == winner:
-                donor = sorted(distribution, key=lambda t: distribution[t], reverse=True)[1]  # 2nd most
-            distribution[donor] -= 1
-            distribution[winner] += 1
-            st.session_state.consolation_applied = True
-        else:
-            st.session_state.consolation_applied = False
-        st.session_state.ball_distribution = distribution
+        consolation = names.index(winner) if winner in names else None
+        counts = initial_counts(FORMAT.probs, FORMAT.total_balls, consolation)
+        distribution = dict(zip(names, counts))
+        st.session_state.consolation_applied = consolation is not None
         st.session_state.app_started = True
         st.session_state.error_message = ""
         assign_ball_numbers(distribution)
@@ -502,123 +412,429 @@ def calculate_initial_distribution():
 
 
 def assign_ball_numbers(distribution):
-    ball_numbers = list(range(1, TOTAL_BALLS + 1))
-    random.shuffle(ball_numbers)
-    owner_map = {}
-    idx = 0
-    for team, count in distribution.items():
-        for _ in range(count):
-            if idx < len(ball_numbers):
-                owner_map[ball_numbers[idx]] = team
-                idx += 1
-    st.session_state.ball_owner_map = owner_map
+    st.session_state.lottery = LotteryState(distribution.keys(), distribution.values())
+    draw_journal = journal()
+    draw_journal.start(st.session_state.lottery, {k: st.session_state.get(k) for k in JOURNAL_META})
+    note_journal(draw_journal)
+    publish_draw()
 
 
 def draw_lottery_ball(drawn_ball_number):
-    if not 1 <= drawn_ball_number <= TOTAL_BALLS:
-        st.error(f"Invalid ball number. Enter a number between 1 and {TOTAL_BALLS}.")
+    lottery = st.session_state.lottery
+    candidates = list(lottery.distribution())
+    draw_journal = journal()
+    try:
+        winner = lottery.names[draw_journal.draw(lottery, drawn_ball_number)]
+    except StaleDraw as e:
+        st.session_state.draw_error = f"{e} Reload the page to follow it."
         return
-    winner = st.session_state.ball_owner_map.get(drawn_ball_number)
-    if not winner:
-        st.error(f"Ball #{drawn_ball_number} has no owner. This is an error.")
+    except ValueError as e:
+        st.session_state.draw_error = str(e)
         return
+    if draw_journal.error:
+        note_journal(draw_journal)
 
+    st.session_state.draw_error = ""
     st.session_state.last_winner = winner
     st.session_state.last_drawn_ball = drawn_ball_number
-    st.session_state.last_draw_candidates = list(st.session_state.ball_distribution.keys())
-    current_pick = len(st.session_state.draft_order) + 1
-    st.session_state.draft_order.append({"pick": current_pick, "team": winner})
-
-    if len(st.session_state.draft_order) < LOTTERY_TEAMS_COUNT:
-        balls_to_redistribute = [b for b, o in st.session_state.ball_owner_map.items() if o == winner]
-        del st.session_state.ball_distribution[winner]
-        remaining = st.session_state.ball_distribution
-        total_remaining = sum(remaining.values())
-        if total_remaining > 0:
-            proportions = {t: c / total_remaining for t, c in remaining.items()}
-            extra = {t: 0 for t in remaining}
-            assigned = 0
-            for t, p in proportions.items():
-                n = round(len(balls_to_redistribute) * p)
-                extra[t] = n
-                assigned += n
-            diff = len(balls_to_redistribute) - assigned
-            if diff != 0:
-                by_prop = sorted(proportions.items(), key=lambda x: x[1], reverse=True)
-                for i in range(abs(diff)):
-                    extra[by_prop[i % len(by_prop)][0]] += int(np.sign(diff))
-            ball_pool = iter(balls_to_redistribute)
-            for t, n in extra.items():
-                st.session_state.ball_distribution[t] += n
-                for _ in range(n):
-                    try:
-                        st.session_state.ball_owner_map[next(ball_pool)] = t
-                    except StopIteration:
-                        break
+    st.session_state.last_draw_candidates = candidates
+    publish_draw()
+
+
+def draft_order(lottery):
+    return [{"pick": i + 1, "team": lottery.names[t]} for i, t in enumerate(lottery.draft)]
+
+
+def full_draft_order(lottery, playoff_teams):
+    """Lottery picks followed by the playoff teams, worst seed first."""
+    order = draft_order(lottery)
+    valid_playoff = [pt for pt in playoff_teams if pt['name'].strip()]
+    for i, team_info in enumerate(sorted(valid_playoff, key=lambda x: x['rank'], reverse=True)):
+        order.append({"pick": len(lottery.names) + i + 1, "team": team_info['name']})
+    return order
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def render_chips(sorted_dist):
+    """Odds-chip HTML for a ((team, balls), ...) tuple, biggest holder first."""
+    current_total = sum(count for _, count in sorted_dist)
+    chips_html = '<div class="ball-pool">'
+    for idx, (team, count) in enumerate(sorted_dist):
+        pct = count / current_total * 100
+        color = CHIP_COLORS[idx % len(CHIP_COLORS)]
+        chips_html += (
+            f'<div class="team-chip" style="background:{color};">'
+            f'<span class="chip-team">{team}</span>'
+            f'<span class="chip-pct">{pct:.1f}%</span>'
+            f'<span class="chip-odds">{american_odds(pct)}</span>'
+            f'<span class="chip-balls">{count} balls</span>'
+            f'</div>'
+        )
+    chips_html += '</div>'
+    return chips_html
+
+
+def ball_list_text(lottery, team):
+    """Comma-joined ball numbers for one team, rebuilt only when its balls moved."""
+    cache = st.session_state.setdefault('ball_text_cache', {})
+    name, revision = lottery.names[team], lottery.revision[team]
+    if cache.get(name, (None,))[0] != revision:
+        cache[name] = (revision, ', '.join(map(str, lottery.balls_of(team))))
+    return cache[name][1]
+
+
+def warm_branch(counts):
+    """Build everything the odds panel shows for ``counts``, filling the shared
+    caches; run in the background for each state the next ball can lead to.
+    Returns the pick-odds matrix."""
+    matrix, _ = pick_odds(counts)
+    if len(counts) <= SENSITIVITY_EAGER_TEAMS:
+        ball_sensitivity(counts)
+    return matrix
+
+
+def render_preview(teams, next_pick, futures):
+    """Pick odds if a given team's ball comes up next, from the background branches."""
+    ready = sum(f.done() for f in futures.values())
+    st.caption(f"{ready} of {len(futures)} outcomes precomputed.")
+    drawn = st.selectbox("If this team's ball comes up", sorted(futures), format_func=teams.__getitem__,
+                         key="preview_team")
+    if drawn is None:
+        return
+    if not futures[drawn].done():
+        st.caption("Still working on this one — reopen in a moment.")
+        return
+    matrix = futures[drawn].result()
+    left = [t for i, t in enumerate(teams) if i != drawn]
+    st.dataframe(
+        pd.DataFrame(
+            matrix * 100,
+            index=pd.Index(left, name="team"),
+            columns=[f"Pick {next_pick + 1 + k}" for k in range(len(left))],
+        ).style.format("{:.1f}%"),
+        use_container_width=True,
+    )
+
+
+def render_sensitivity(teams, counts, first_pick):
+    """Heatmap of how each pick probability shifts (percentage points) when one ball changes hands."""
+    sens = ball_sensitivity(counts)
+    moves = [(a, b) for a in range(len(teams)) for b in range(len(teams)) if a != b and counts[a] > 0]
+    labels = ["Largest change (any move)"] + [f"{teams[a]} → {teams[b]}" for a, b in moves]
+    choice = st.selectbox("Ball move", range(len(labels)), format_func=labels.__getitem__, key="sensitivity_move")
+    grid = largest_change(sens) if choice == 0 else sens[moves[choice - 1]]
+    heat = pd.DataFrame(
+        [{"team": t, "pick": f"Pick {first_pick + k}", "change": grid[i, k] * 100}
+         for i, t in enumerate(teams) for k in range(len(teams))]
+    )
+    chart = alt.Chart(heat).mark_rect().encode(
+        x=alt.X("pick:O", sort=None, title=None),
+        y=alt.Y("team:O", sort=teams, title=None),
+        color=alt.Color("change:Q", title="Δ pp", scale=alt.Scale(scheme="redblue", domainMid=0, reverse=True)),
+        tooltip=["team", "pick", alt.Tooltip("change:Q", format="+.2f")],
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+
+def render_profiler():
+    """Sidebar panel: section timings and payloads of the latest reruns, pick latency, JSON export."""
+    prof = tracer()
+    if not prof.enabled:
+        return
+    with st.expander("⏱ Profiling", expanded=True):
+        for kind in ("full run", "live_draw", "odds_panel", "draft_table"):
+            run = prof.last_run(kind)
+            if run is None:
+                continue
+            st.markdown(f"**Last {kind}** — {run['total_ms']:.1f} ms, {run['payload_bytes'] / 1024:.1f} KiB sent")
+            st.dataframe(
+                pd.DataFrame([{"section": "  " * s["depth"] + s["name"], "ms": round(s.get("ms", 0.0), 2)}
+                              for s in run["sections"]]),
+                hide_index=True, use_container_width=True,
+            )
+            if run["payloads"]:
+                st.dataframe(pd.DataFrame(run["payloads"]), hide_index=True, use_container_width=True)
+        if st.session_state.get("celebration"):
+            measured = st.session_state.celebration
+            st.caption(f"Celebration: {measured['fps']} fps measured, particles at {measured['scale']:.0%}")
+        if prof.picks:
+            st.markdown("**Submit → reveal (server side)**")
+            st.dataframe(pd.DataFrame(prof.picks).round(1), hide_index=True, use_container_width=True)
+        st.download_button("Download JSON trace", prof.to_json(), "lottery_trace.json", "application/json")
+
+
+def switch_league():
+    st.query_params["league"] = st.session_state.league_picker
+
+
+def switch_format():
+    st.query_params["size"] = st.session_state.format_picker
+
+
+def journal():
+    """On-disk journal of this tab's draw (one per league, size and ?draw= id)."""
+    return DrawJournal(os.path.join(JOURNAL_DIR, f"{league_id}.{FORMAT_KEY}.{draw_id}.jsonl"))
+
+
+def note_journal(draw_journal):
+    """Keep the journal warning in step with the journal's last write: the draw
+    goes on without it, but the commissioner should know a restart loses it."""
+    st.session_state.journal_error = (
+        f"Can't write the draw journal ({draw_journal.error}). The draw goes on, "
+        "but a server restart or reload won't be able to resume it."
+        if draw_journal.error else ""
+    )
+
+
+def restore_draw():
+    """Pick up a draw a restart or reload cut short, from the journal."""
+    draw_journal = journal()
+    restored = draw_journal.load()
+    note_journal(draw_journal)
+    if restored is None:
+        return
+    lottery, meta, _ = restored
+    for key in JOURNAL_META:
+        if key in meta:
+            st.session_state[key] = meta[key]
+    st.session_state.lottery = lottery
+    st.session_state.app_started = True
+    if lottery.draft:
+        # already celebrated in the session that drew it
+        st.session_state.last_winner = st.session_state.last_celebrated = lottery.names[lottery.draft[-1]]
+        st.session_state.final_celebrated = lottery.complete
+    st.toast(f"Restored the draw in progress — {len(lottery.draft)} of {len(lottery.names)} picks made.", icon="💾")
+    publish_draw()
 
 
 def reset_app():
+    journal().clear()
+    channel().publish(None)
+    del st.query_params["draw"]
     for key in list(st.session_state.keys()):
         del st.session_state[key]
     st.rerun()
 
 
+# ── Spectators (?view=watch): follow the commissioner's draw, read-only ───────
+def channel():
+    """Broadcast channel of this tab's draw (same key as the journal)."""
+    return get_channel(f"{league_id}.{FORMAT_KEY}.{draw_id}")
+
+
+def draw_event(lottery, playoff_teams, consolation, last_ball):
+    """Plain-data snapshot of a draw for spectators (never mutated once published)."""
+    return {
+        "names": lottery.names,
+        "distribution": tuple(lottery.distribution().items()),
+        "draft": tuple(lottery.draft),
+        "last_ball": last_ball,
+        "consolation": consolation,
+        "final_order": full_draft_order(lottery, playoff_teams) if lottery.complete else None,
+    }
+
+
+def publish_draw():
+    """Send spectators the commissioner's current draw."""
+    lottery = st.session_state.lottery
+    consolation = st.session_state.consolation_winner if st.session_state.get('consolation_applied') else None
+    channel().publish(draw_event(lottery, st.session_state.playoff_teams, consolation,
+                                 st.session_state.get('last_drawn_ball')))
+
+
+def spectator_link():
+    params = {"view": "watch", "draw": draw_id}
+    if league_id != DEFAULT_LEAGUE:
+        params["league"] = league_id
+    if FORMAT_KEY != DEFAULT_FORMAT:
+        params["size"] = FORMAT_KEY
+    return "?" + "&".join(f"{k}={v}" for k, v in params.items())
+
+
+@st.fragment(run_every=SPECTATOR_POLL)
+def spectator_poll():
+    """Marks this spectator as watching and reruns the page only once the
+    commissioner has published something it has not shown yet."""
+    ch = channel()
+    ch.touch(st.session_state.setdefault('viewer_id', uuid.uuid4().hex))
+    if ch.latest()[0] != st.session_state.get('spectator_version'):
+        st.rerun()
+
+
+def spectator_feed():
+    """Everything a spectator sees, built from the latest broadcast event; the
+    chips and odds it shows are cache hits the commissioner's session paid for."""
+    ch = channel()
+    version, event = ch.latest()
+    if version == 0:
+        # Nothing published since the server started: follow the journal instead
+        restored = journal().load()
+        if restored is not None:
+            lottery, meta, draws = restored
+            consolation = meta.get('consolation_winner') if meta.get('consolation_applied') else None
+            ch.publish(draw_event(lottery, meta.get('playoff_teams', []), consolation,
+                                  draws[-1] if draws else None))
+            version, event = ch.latest()
+    st.session_state.spectator_version = version
+    if event is None:
+        st.info("Waiting for the commissioner to start the draw…")
+        return
+
+    draft, names = event["draft"], event["names"]
+    if event["consolation"]:
+        st.caption(f"🏅 Consolation: {event['consolation']} received +1 ball")
+    if draft:
+        send_markdown("winner_banner", f"""
+        <div class="winner-banner">
+            <div class="winner-label">🏆 Pick #{len(draft)} Winner</div>
+            <div class="ball-spin">{event['last_ball'] or '--'}</div>
+            <div class="winner-pick">{names[draft[-1]]}</div>
+        </div>
+        """)
+
+    if event["final_order"] is not None:
+        send_markdown("final_banner", """
+        <div class="final-banner">
+            <div class="final-banner-title">🏆 Final Draft Order</div>
+        </div>
+        """)
+        send_table("final_table", pd.DataFrame(event["final_order"]).set_index("pick"))
+        return
+
+    next_pick = len(draft) + 1
+    send_markdown("pick_header", f'<div class="pick-header">Drawing for Pick #{next_pick}</div>')
+    col_draft, col_odds = st.columns([1, 2])
+    with col_draft:
+        if draft:
+            st.markdown("**Draft Order So Far**")
+            st.dataframe(pd.DataFrame([{"pick": i + 1, "team": names[t]} for i, t in enumerate(draft)])
+                         .set_index("pick"), use_container_width=True)
+    with col_odds:
+        distribution = event["distribution"]
+        st.markdown(f"**Current Odds — Pick #{next_pick}**")
+        send_markdown("chips", render_chips(tuple(sorted(distribution, key=lambda kv: kv[1], reverse=True))))
+        matrix, _ = pick_odds(count for _, count in distribution)
+        st.dataframe(
+            pd.DataFrame(
+                matrix * 100,
+                index=pd.Index([team for team, _ in distribution], name="team"),
+                columns=[f"Pick {next_pick + k}" for k in range(len(distribution))],
+            ).style.format("{:.1f}%"),
+            use_container_width=True,
+        )
+
+
+# ── League selection (?league=<id>; each league keeps its own draw state) ─────
+league_id, standings_dir = resolve_league(st.query_params.get("league"), LEAGUES_DIR, STANDINGS_DIR)
+if (st.session_state.get('league_id', league_id), st.session_state.get('league_format', FORMAT_KEY)) != (league_id, FORMAT_KEY):
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+# ── Draw id (?draw=<id>): a reload of this URL resumes this tab's draw; a new tab starts its own ──
+draw_id = st.query_params.get("draw", "")
+if not DRAW_ID_RE.fullmatch(draw_id):
+    draw_id = None
+
+if st.query_params.get("view") == "watch":
+    # No sidebar, setup widgets or celebration iframes: just the live feed
+    send_markdown("hero", """
+    <div class="hero-banner">
+        <div class="hero-title">🏈 Dynasty Draft Lottery</div>
+        <div class="hero-subtitle">Live Draw — Spectator View</div>
+    </div>
+    """)
+    if draw_id is None:
+        st.info("Open the spectator link from the bottom of the commissioner's sidebar to follow their draw.")
+    else:
+        spectator_feed()
+        spectator_poll()
+    tracer().end()
+    st.stop()
+
+
+if draw_id is None:
+    draw_id = st.query_params["draw"] = uuid.uuid4().hex[:12]
+
 # ── Session state init (only on first load) ───────────────────────────────────
 if 'app_started' not in st.session_state:
+    st.session_state.league_id = league_id
+    st.session_state.league_format = FORMAT_KEY
     st.session_state.app_started = False
     st.session_state.lottery_teams = [{"name": "", "max_pf": 1000.0} for _ in range(LOTTERY_TEAMS_COUNT)]
     st.session_state.playoff_teams = [{"name": "", "rank": i + 1} for i in range(PLAYOFF_TEAMS_COUNT)]
-    st.session_state.ball_distribution = {}
-    st.session_state.ball_owner_map = {}
-    st.session_state.draft_order = []
+    st.session_state.lottery = None
     st.session_state.consolation_applied = False
     st.session_state.consolation_winner = None
     st.session_state.error_message = ""
     st.session_state.last_winner = None
     st.session_state.last_drawn_ball = None
     st.session_state.last_draw_candidates = []
+    st.session_state.draw_error = ""
     st.session_state.last_celebrated = None
     st.session_state.final_celebrated = False
     st.session_state.standings_year = None
 
-    year, path = find_latest_standings()
-    if path:
-        df = load_standings(path)
-        if df is not None:
-            lottery_rows = df[df["Rank"] > PLAYOFF_TEAMS_COUNT].sort_values("Rank")
-            playoff_rows = df[df["Rank"] <= PLAYOFF_TEAMS_COUNT].sort_values("Rank")
-            for i, (_, row) in enumerate(lottery_rows.iterrows()):
-                if i < LOTTERY_TEAMS_COUNT:
-                    st.session_state.lottery_teams[i] = {
-                        "name": str(row["Team"]),
-                        "max_pf": float(row["MaxPF"]),
-                    }
-            for i, (_, row) in enumerate(playoff_rows.iterrows()):
-                if i < PLAYOFF_TEAMS_COUNT:
-                    st.session_state.playoff_teams[i] = {
-                        "name": str(row["Team"]),
-                        "rank": int(row["Rank"]),
-                    }
-            st.session_state.standings_year = year
+    year, df = get_catalog(standings_dir).latest()
+    if df is not None:
+        lottery_rows = df[df["Rank"] > PLAYOFF_TEAMS_COUNT].sort_values("Rank")
+        playoff_rows = df[df["Rank"] <= PLAYOFF_TEAMS_COUNT].sort_values("Rank")
+        for i, (_, row) in enumerate(lottery_rows.iterrows()):
+            if i < LOTTERY_TEAMS_COUNT:
+                st.session_state.lottery_teams[i] = {
+                    "name": str(row["Team"]),
+                    "max_pf": float(row["MaxPF"]),
+                }
+        for i, (_, row) in enumerate(playoff_rows.iterrows()):
+            if i < PLAYOFF_TEAMS_COUNT:
+                st.session_state.playoff_teams[i] = {
+                    "name": str(row["Team"]),
+                    "rank": int(row["Rank"]),
+                }
+        st.session_state.standings_year = year
+
+    restore_draw()
 
 
 # ── Hero banner ───────────────────────────────────────────────────────────────
 yr = st.session_state.standings_year
+league_label = "" if league_id == DEFAULT_LEAGUE else f"League {league_id} &nbsp;·&nbsp; "
+if FORMAT_KEY != DEFAULT_FORMAT:
+    league_label += f"{FORMAT.label} &nbsp;·&nbsp; "
 caption_html = (
-    f"<div class='hero-caption'>Season {yr} &nbsp;·&nbsp; auto-loaded from Dynasty{yr}.csv</div>"
+    f"<div class='hero-caption'>{league_label}Season {yr} &nbsp;·&nbsp; auto-loaded from Dynasty{yr}.csv</div>"
     if yr else ""
 )
-st.markdown(f"""
-<div class="hero-banner">
-    <div class="hero-title">🏈 Dynasty Draft Lottery</div>
-    <div class="hero-subtitle">Live Weighted Ball Draw System</div>
-    {caption_html}
-</div>
-""", unsafe_allow_html=True)
+with tracer().section("hero"):
+    send_markdown("hero", f"""
+    <div class="hero-banner">
+        <div class="hero-title">🏈 Dynasty Draft Lottery</div>
+        <div class="hero-subtitle">Live Weighted Ball Draw System</div>
+        {caption_html}
+    </div>
+    """)
 
 
 # ── Sidebar ───────────────────────────────────────────────────────────────────
-with st.sidebar:
+with tracer().section("sidebar"), st.sidebar:
+    leagues = list(list_leagues(LEAGUES_DIR, STANDINGS_DIR))
+    if len(leagues) > 1:
+        st.selectbox(
+            "League",
+            leagues,
+            index=leagues.index(league_id),
+            key="league_picker",
+            on_change=switch_league,
+        )
+    formats = list(LEAGUE_FORMATS)
+    st.selectbox(
+        "League size",
+        formats,
+        index=formats.index(FORMAT_KEY),
+        format_func=lambda k: f"{LEAGUE_FORMATS[k].label} · {LEAGUE_FORMATS[k].total_balls:,} balls",
+        key="format_picker",
+        on_change=switch_format,
+        help="Changing the size starts a fresh setup.",
+    )
     st.markdown("### ⚙️ Team Setup")
     if yr:
         st.caption(f"Pre-filled from Dynasty{yr}.csv — edit any field below.")
@@ -691,144 +907,215 @@ with st.sidebar:
         st.error(st.session_state.error_message)
 
     st.divider()
+    st.caption(f"📺 [Spectator view]({spectator_link()}) · {channel().viewers()} watching")
     if st.button("🔄  Reset Application", use_container_width=True):
         reset_app()
 
-
-# ── Main body ─────────────────────────────────────────────────────────────────
-if not st.session_state.get('app_started'):
-    st.markdown("""
-    <div class="card" style="text-align:center; padding:3rem 2rem;">
-        <div style="font-size:2.5rem; margin-bottom:0.75rem;">⬅️</div>
-        <div style="font-size:1.05rem; color:#7a8fa8;">
-            Set up your teams in the sidebar and click
-            <strong style="color:#FFB627;">Calculate Initial Distribution</strong>
-            to begin.
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-else:
+    if PROFILING:
+        render_profiler()
+
+
+# ── Draw panel fragments ──────────────────────────────────────────────────────
+# A draw only reruns these fragments, not the CSS, hero banner or sidebar; the
+# odds panel is nested so its own widgets (sensitivity picker, expanders) rerun
+# just that panel.
+def submit_ball():
+    tracer().submitted(len(st.session_state.lottery.draft) + 1)
+    draw_lottery_ball(int(st.session_state.drawn_ball_input))
+
+
+@st.fragment
+@traced("draft_table")
+def draft_table():
+    lottery = st.session_state.lottery
+    if lottery.draft:
+        send_markdown("card", '<div class="card">')
+        st.markdown("**Draft Order So Far**")
+        with tracer().section("draft_table.dataframe"):
+            draft_df = pd.DataFrame(draft_order(lottery)).sort_values("pick")
+            st.dataframe(draft_df.set_index("pick"), use_container_width=True)
+        send_markdown("card", '</div>')
+
+
+@st.fragment
+@traced("odds_panel")
+def odds_panel():
+    lottery = st.session_state.lottery
+    ball_distribution = lottery.distribution()
+    if not ball_distribution:
+        return
+    next_pick = len(lottery.draft) + 1
+    send_markdown("card", '<div class="card">')
+    st.markdown(f"**Current Odds — Pick #{next_pick}**")
+    with tracer().section("odds_panel.chips"):
+        sorted_dist = sorted(ball_distribution.items(), key=lambda kv: kv[1], reverse=True)
+        chips_html = render_chips(tuple(sorted_dist))
+        send_markdown("chips", chips_html)
+    send_markdown("card", '</div>')
+
+    # Exact odds for every remaining pick (memoized process-wide by ball counts)
+    send_markdown("card", '<div class="card">')
+    st.markdown("**Pick Probabilities**")
+    remaining_teams = list(ball_distribution)
+    with tracer().section("odds_panel.pick_probabilities"):
+        matrix, exact = pick_odds(ball_distribution.values())
+        if not exact:
+            st.caption(f"{len(remaining_teams)} teams left — simulated from 20,000 replays of the live rules (±0.4 pp).")
+        odds_df = pd.DataFrame(
+            matrix * 100,
+            index=pd.Index(remaining_teams, name="team"),
+            columns=[f"Pick {next_pick + k}" for k in range(len(remaining_teams))],
+        )
+        st.dataframe(odds_df.style.format("{:.1f}%"), use_container_width=True)
+    send_markdown("card", '</div>')
+
+    # Warm every state the next ball can lead to while the room waits
+    counts = list(ball_distribution.values())
+    holder = st.session_state.setdefault('speculate_holder', uuid.uuid4().hex)
+    futures = precompute(counts, warm_branch, holder)
+    cancel_branches(st.session_state.get('branch_futures', {}).values(), keep=futures.values(), holder=holder)
+    st.session_state.branch_futures = futures
+    with tracer().section("odds_panel.preview"), st.expander("What If — Next Ball"):
+        render_preview(remaining_teams, next_pick, futures)
+
+    with tracer().section("odds_panel.sensitivity"), st.expander("Sensitivity — Moving One Ball"):
+        if len(remaining_teams) > EXACT_MAX_TEAMS:
+            st.caption(f"Available once {EXACT_MAX_TEAMS} teams are left.")
+        elif len(remaining_teams) <= SENSITIVITY_EAGER_TEAMS or st.toggle(
+            "Compute (a few seconds at this size)", key="sensitivity_on"
+        ):
+            render_sensitivity(remaining_teams, counts, next_pick)
+
+    with tracer().section("odds_panel.ball_assignments"), st.expander("Ball Number Assignments"):
+        if lottery.seed is not None:
+            st.caption(f"Shuffled from seed {lottery.seed} — `LotteryState(teams, balls, seed={lottery.seed})` "
+                       "rebuilds these exact numbers.")
+        by_name = sorted(lottery.remaining(), key=lambda t: lottery.names[t])
+        if lottery.total_balls > BALL_LIST_INLINE:
+            # Thousands of numbers: only the selected team's list is built and sent
+            by_name = [st.selectbox(
+                "Team", by_name, format_func=lambda t: f"{lottery.names[t]} ({len(lottery.balls_of(t))} balls)",
+                key="ball_list_team",
+            )]
+        for t in by_name:
+            st.markdown(f"**{lottery.names[t]} ({len(lottery.balls_of(t))} balls):**")
+            st.text(ball_list_text(lottery, t))
+
+
+@st.fragment
+@traced("live_draw")
+def live_draw():
     # ── Status strip ──────────────────────────────────────────────────────────
-    picks_done = len(st.session_state.draft_order)
+    lottery = st.session_state.lottery
+    picks_done = len(lottery.draft)
     next_pick = picks_done + 1
-    teams_left = len(st.session_state.ball_distribution)
+    teams_left = len(lottery.remaining())
 
     m1, m2 = st.columns(2)
     m1.metric("Next Pick", f"#{next_pick}" if picks_done < LOTTERY_TEAMS_COUNT else "Done")
     m2.metric("Teams Remaining", teams_left)
     if st.session_state.consolation_applied:
         st.caption(f"🏅 Consolation: {st.session_state.consolation_winner} received +1 ball")
-    st.markdown("<div style='margin-bottom:1.1rem;'></div>", unsafe_allow_html=True)
+    send_markdown("spacer", "<div style='margin-bottom:1.1rem;'></div>")
 
     # ── Per-pick winner celebration ───────────────────────────────────────────
+    # Events are queued before the component renders, which keeps it first in the
+    # fragment after the status strip: same spot every run, same frame.
     last_w = st.session_state.last_winner
-    if last_w and last_w != st.session_state.get('last_celebrated'):
+    fresh = bool(last_w) and last_w != st.session_state.get('last_celebrated')
+    if fresh:
+        celebrate("pick", winner=last_w, candidates=st.session_state.get('last_draw_candidates', []),
+                  pick=picks_done)
+        st.session_state.last_celebrated = last_w
+    if picks_done >= LOTTERY_TEAMS_COUNT and not st.session_state.get('final_celebrated'):
+        celebrate("finale")
+        st.session_state.final_celebrated = True
+    celebration()
+
+    # the component's frame-rate report reruns the fragment; keep the banner up through it
+    measured = st.session_state.pop('celebration_rerun', False)
+    if fresh or (measured and last_w):
         completed = picks_done
-        st.markdown(f"""
+        spin_attrs, spin_text = (('class="ball-spin" id="lottery-ball-spin"', "--") if fresh
+                                 else ('class="ball-spin locked"', last_w))
+        send_markdown("winner_banner", f"""
         <div class="winner-banner">
             <div class="winner-label">🏆 Pick #{completed} Winner</div>
-            <div class="ball-spin" id="lottery-ball-spin">--</div>
+            <div {spin_attrs}>{spin_text}</div>
             <div class="winner-pick">Selects with the #{completed} overall pick</div>
         </div>
-        """, unsafe_allow_html=True)
-        celebrate_winner(
-            st.session_state.last_drawn_ball or 1,
-            st.session_state.get('last_draw_candidates', []),
-            last_w,
-        )
-        st.session_state.last_celebrated = last_w
+        """)
+        if fresh:
+            tracer().revealed(completed)
 
     # ── Drawing phase ─────────────────────────────────────────────────────────
     if picks_done < LOTTERY_TEAMS_COUNT:
-        st.markdown(f'<div class="pick-header">Drawing for Pick #{next_pick}</div>', unsafe_allow_html=True)
+        send_markdown("pick_header", f'<div class="pick-header">Drawing for Pick #{next_pick}</div>')
 
         col_draw, col_state = st.columns([1, 2])
 
         with col_draw:
-            st.markdown('<div class="card">', unsafe_allow_html=True)
+            send_markdown("card", '<div class="card">')
             st.markdown("**Draw a Ball**")
             drawn_ball = st.number_input(
-                "Ball Number (1–200)",
+                f"Ball Number (1–{lottery.total_balls})",
                 min_value=1,
-                max_value=TOTAL_BALLS,
+                max_value=lottery.total_balls,
                 step=1,
                 key="drawn_ball_input",
             )
-            if st.button(f"Submit Ball #{int(drawn_ball)}", type="primary", use_container_width=True):
-                draw_lottery_ball(drawn_ball)
-                st.rerun()
-            st.markdown('</div>', unsafe_allow_html=True)
-
-            if st.session_state.draft_order:
-                st.markdown('<div class="card">', unsafe_allow_html=True)
-                st.markdown("**Draft Order So Far**")
-                draft_df = pd.DataFrame(st.session_state.draft_order).sort_values("pick")
-                st.dataframe(draft_df.set_index("pick"), use_container_width=True)
-                st.markdown('</div>', unsafe_allow_html=True)
+            # on_click runs before the fragment reruns, so the new state renders in one pass
+            st.button(
+                f"Submit Ball #{int(drawn_ball)}",
+                on_click=submit_ball,
+                type="primary",
+                use_container_width=True,
+            )
+            if st.session_state.get('draw_error'):
+                st.error(st.session_state.draw_error)
+            if st.session_state.get('journal_error'):
+                st.warning(st.session_state.journal_error)
+            send_markdown("card", '</div>')
+
+            draft_table()
 
         with col_state:
-            if st.session_state.ball_distribution:
-                st.markdown('<div class="card">', unsafe_allow_html=True)
-                st.markdown(f"**Current Odds — Pick #{next_pick}**")
-
-                current_total = sum(st.session_state.ball_distribution.values())
-                sorted_dist = sorted(
-                    st.session_state.ball_distribution.items(),
-                    key=lambda kv: kv[1], reverse=True,
-                )
-                chips_html = '<div class="ball-pool">'
-                for idx, (team, count) in enumerate(sorted_dist):
-                    pct = count / current_total * 100
-                    color = CHIP_COLORS[idx % len(CHIP_COLORS)]
-                    chips_html += (
-                        f'<div class="team-chip" style="background:{color};">'
-                        f'<span class="chip-team">{team}</span>'
-                        f'<span class="chip-pct">{pct:.1f}%</span>'
-                        f'<span class="chip-odds">{american_odds(pct)}</span>'
-                        f'<span class="chip-balls">{count} balls</span>'
-                        f'</div>'
-                    )
-                chips_html += '</div>'
-                st.markdown(chips_html, unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-
-                with st.expander("Ball Number Assignments"):
-                    team_balls: dict = {t: [] for t in st.session_state.ball_distribution}
-                    for ball, team in st.session_state.ball_owner_map.items():
-                        if team in team_balls:
-                            team_balls[team].append(ball)
-                    for team, balls in sorted(team_balls.items()):
-                        balls.sort()
-                        st.markdown(f"**{team} ({len(balls)} balls):**")
-                        st.text(', '.join(map(str, balls)))
+            odds_panel()
 
     # ── Final draft order ─────────────────────────────────────────────────────
     else:
-        if picks_done == LOTTERY_TEAMS_COUNT - 1:
-            last_team = list(st.session_state.ball_distribution.keys())[0]
-            st.session_state.draft_order.append({"pick": LOTTERY_TEAMS_COUNT, "team": last_team})
-
-        st.markdown("""
+        send_markdown("final_banner", """
         <div class="final-banner">
             <div class="final-banner-title">🏆 Final Draft Order</div>
         </div>
-        """, unsafe_allow_html=True)
+        """)
+
+        final_order = full_draft_order(lottery, st.session_state.playoff_teams)
+
+        with tracer().section("final_table"):
+            send_table("final_table", pd.DataFrame(final_order).sort_values("pick").set_index("pick"))
 
-        final_order = st.session_state.draft_order.copy()
-        valid_playoff = [pt for pt in st.session_state.playoff_teams if pt['name'].strip()]
-        for i, team_info in enumerate(sorted(valid_playoff, key=lambda x: x['rank'], reverse=True)):
-            final_order.append({"pick": LOTTERY_TEAMS_COUNT + i + 1, "team": team_info['name']})
 
-        st.table(pd.DataFrame(final_order).sort_values("pick").set_index("pick"))
 
-        if not st.session_state.get('final_celebrated'):
-            fire_fireworks_barrage()
-            st.session_state.final_celebrated = True
+# ── Main body ─────────────────────────────────────────────────────────────────
+audio_preload()
+
+if not st.session_state.get('app_started'):
+    send_markdown("start_card", """
+    <div class="card" style="text-align:center; padding:3rem 2rem;">
+        <div style="font-size:2.5rem; margin-bottom:0.75rem;">⬅️</div>
+        <div style="font-size:1.05rem; color:#7a8fa8;">
+            Set up your teams in the sidebar and click
+            <strong style="color:#FFB627;">Calculate Initial Distribution</strong>
+            to begin.
+        </div>
+    </div>
+    """)
+
+else:
+    live_draw()
 
 
 # ── Footer ────────────────────────────────────────────────────────────────────
-st.markdown(
-    '<div class="footer-note">Dynasty Fantasy Football League &nbsp;·&nbsp; Lottery Simulator</div>',
-    unsafe_allow_html=True,
-)
+send_markdown("footer", '<div class="footer-note">Dynasty Fantasy Football League &nbsp;·&nbsp; Lottery Simulator</div>')
+tracer().end()
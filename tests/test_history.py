@@ -0,0 +1,27 @@
+"""lottery_field: which season rows enter the lottery and who won the consolation."""
+import pandas as pd
+import pytest
+
+from lottery.history import lottery_field
+
+
+@pytest.fixture
+def table():
+    # 14 teams a season; MaxPF falls with rank, so pool order is the rank order reversed
+    rows = [(season, f"T{rank}", 2000 - 10 * rank, rank) for season in (2024, 2025) for rank in range(1, 15)]
+    return pd.DataFrame(rows, columns=["Season", "Team", "MaxPF", "Rank"])
+
+
+def test_auto_consolation_is_first_rank_past_the_playoff_line(table):
+    field = lottery_field(table, playoff_teams=6, lottery_teams=8)
+    assert len(field) == 16 and field["Rank"].min() == 7
+    assert (field.loc[field["Team"] == "T7", "Pool"] == 7).all()
+    assert (field["Consolation"] == 7).all()
+
+
+def test_consolation_none_and_by_name(table):
+    assert (lottery_field(table, 6, 8, consolation="none")["Consolation"] == -1).all()
+    table = table[(table["Season"] == 2025) | (table["Team"] != "T10")]
+    table = pd.concat([table, pd.DataFrame([(2024, "X", 1000, 15)], columns=table.columns)])
+    field = lottery_field(table, 6, 8, consolation="T10")
+    assert field.groupby("Season")["Consolation"].first().to_dict() == {2024: -1, 2025: 4}
@@ -0,0 +1,76 @@
+"""DrawJournal: replay, stale-draw refusal, torn tails and unusable paths."""
+import json
+
+import pytest
+
+from lottery import DrawJournal, LotteryState, StaleDraw
+
+
+def new_state():
+    return LotteryState(["a", "b", "c", "d"], [50, 30, 15, 5], seed=11)
+
+
+def test_restores_draws(tmp_path):
+    journal, state = DrawJournal(str(tmp_path / "draw.jsonl")), new_state()
+    journal.start(state, {"year": 2025})
+    journal.draw(state, 3)
+    journal.draw(state, 40)
+    restored, meta, draws = journal.load()
+    assert draws == [3, 40] and meta == {"year": 2025}
+    assert restored.fingerprint() == state.fingerprint()
+
+
+def test_stale_copy_is_refused(tmp_path):
+    path = str(tmp_path / "draw.jsonl")
+    state = new_state()
+    DrawJournal(path).start(state)
+    behind = LotteryState.from_snapshot(state.snapshot())
+    DrawJournal(path).draw(state, 3)
+    with pytest.raises(StaleDraw, match="pick 2"):
+        DrawJournal(path).draw(behind, 7)
+    assert behind.draft == []
+    assert DrawJournal(path).load()[2] == [3]
+
+
+def test_reset_elsewhere_is_refused(tmp_path):
+    journal, state = DrawJournal(str(tmp_path / "draw.jsonl")), new_state()
+    journal.start(state)
+    journal.clear()
+    with pytest.raises(StaleDraw, match="gone"):
+        journal.draw(state, 3)
+
+
+def test_torn_tail_is_cut_off(tmp_path):
+    path = tmp_path / "draw.jsonl"
+    journal, state = DrawJournal(str(path)), new_state()
+    journal.start(state)
+    journal.draw(state, 3)
+    good = path.stat().st_size
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op":"draw","pi')
+    assert DrawJournal(str(path)).load()[2] == [3]
+    assert path.stat().st_size == good
+    DrawJournal(str(path)).draw(state, 40)
+    assert DrawJournal(str(path)).load()[2] == [3, 40]
+
+
+def test_draw_from_another_state_is_cut_off(tmp_path):
+    path = tmp_path / "draw.jsonl"
+    journal, state = DrawJournal(str(path)), new_state()
+    journal.start(state)
+    good = path.stat().st_size
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "draw", "pick": 1, "rev": state.fingerprint() ^ 1, "ball": 3}) + "\n")
+    assert DrawJournal(str(path)).load()[2] == []
+    assert path.stat().st_size == good
+
+
+def test_unusable_path_never_blocks_a_draw(tmp_path):
+    (tmp_path / "Journals").write_text("not a directory")
+    path = str(tmp_path / "Journals" / "draw.jsonl")
+    journal, state = DrawJournal(path), new_state()
+    assert journal.load() is None and isinstance(journal.error, NotADirectoryError)
+    assert journal.start(state) is False and isinstance(journal.error, OSError)
+    assert DrawJournal(path).draw(state, 3) == state.draft[0]
+    DrawJournal(path).draw(state, 40)
+    assert len(state.draft) == 2
@@ -0,0 +1,21 @@
+"""The optimizer: target parsing and scoring past the exact engine's limit."""
+import pytest
+
+from lottery import EXACT_MAX_TEAMS, candidates, optimize, parse_target
+
+
+def test_parse_target():
+    assert parse_target("team1 top3 >= 90%") == (0, "top", 3, ">=", 0.9)
+    assert parse_target("worst pick1 <= 0.5") == (0, "pick", 1, "<=", 0.5)
+    with pytest.raises(ValueError):
+        parse_target("team1 top three")
+
+
+def test_big_pools_are_replayed():
+    n = EXACT_MAX_TEAMS + 2
+    results = optimize(["team1 pick1 >= 20%"], candidates(n, exp_bases=(1.5, 1.8), totals=(2000,)), workers=0)
+    assert [r["exact"] for r in results] == [False, False]
+    assert [r["candidate"].exp_base for r in results] == [1.8, 1.5]
+    for r in results:
+        assert r["matrix"].shape == (n, n)
+        assert r["matrix"].sum(axis=1) == pytest.approx(1.0)
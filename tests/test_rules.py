@@ -0,0 +1,95 @@
+"""The shared ball rules against the original app's draw code, and the batch
+exact solver against the memoized one."""
+import numpy as np
+import pytest
+
+from lottery import (
+    COMMON_POOL_SIZES, INITIAL_PROBS, METHODS, TOTAL_BALLS, apportion, initial_counts, pick_probabilities,
+    pick_probabilities_batch, pool_tables, redistribute,
+)
+
+
+def baseline_initial(probs, total_balls, consolation):
+    """``calculate_initial_distribution`` as the app first shipped it, on indices."""
+    distribution = {i: int(round(total_balls * p / 100)) for i, p in enumerate(probs)}
+    assigned = sum(distribution.values())
+    if assigned != total_balls:
+        distribution[0] += total_balls - assigned
+    if consolation is not None:
+        donor = max(distribution, key=lambda t: distribution[t])
+        if donor == consolation:
+            donor = sorted(distribution, key=lambda t: distribution[t], reverse=True)[1]
+        distribution[donor] -= 1
+        distribution[consolation] += 1
+    return list(distribution.values())
+
+
+def baseline_redistribute(counts, winner):
+    """The extra balls ``draw_lottery_ball`` handed each remaining team."""
+    remaining = {t: c for t, c in enumerate(counts) if t != winner}
+    total_remaining = sum(remaining.values())
+    proportions = {t: c / total_remaining for t, c in remaining.items()}
+    extra = {t: round(counts[winner] * p) for t, p in proportions.items()}
+    diff = counts[winner] - sum(extra.values())
+    if diff != 0:
+        by_prop = sorted(proportions.items(), key=lambda x: x[1], reverse=True)
+        for i in range(abs(diff)):
+            extra[by_prop[i % len(by_prop)][0]] += int(np.sign(diff))
+    return list(extra.values())
+
+
+def test_initial_counts_pinned():
+    assert initial_counts() == [144, 32, 16, 5, 2, 1]
+    assert initial_counts(INITIAL_PROBS, TOTAL_BALLS, 1) == [143, 33, 16, 5, 2, 1]
+    assert initial_counts(INITIAL_PROBS, TOTAL_BALLS, 0) == [145, 31, 16, 5, 2, 1]
+
+
+@pytest.mark.parametrize("total_balls", [100, 200, 500, 681, 1000, 5000])
+@pytest.mark.parametrize("consolation", [None, 0, 1, 2, 3, 4, 5])
+def test_initial_counts_match_baseline(total_balls, consolation):
+    assert initial_counts(INITIAL_PROBS, total_balls, consolation) == \
+        baseline_initial(INITIAL_PROBS, total_balls, consolation)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_pool_tables_match_uncached(method):
+    probs = (60, 25, 10, 5) if method == "largest_remainder" else tuple(INITIAL_PROBS)
+    table = pool_tables(probs, method)
+    assert sorted(table) == sorted(COMMON_POOL_SIZES)
+    for total, counts in table.items():
+        expected = baseline_initial(probs, total, None) if method == "current" else apportion(probs, total, method)
+        assert list(counts) == list(expected)
+        assert initial_counts(probs, total, method=method) == list(counts)
+
+
+def test_redistribute_pinned():
+    assert redistribute([143, 32, 16, 5, 2, 2], 0) == [80, 40, 13, 5, 5]
+    assert redistribute([17, 40, 5], 1) == [31, 9]
+
+
+def test_redistribute_matches_baseline():
+    rng = np.random.default_rng(1)
+    for _ in range(2000):
+        counts = rng.integers(1, 300, size=rng.integers(2, 9)).tolist()
+        winner = int(rng.integers(len(counts)))
+        assert redistribute(counts, winner) == baseline_redistribute(counts, winner), (counts, winner)
+
+
+@pytest.mark.parametrize("method", ["current", "largest_remainder", "webster", "dhondt"])
+def test_batch_matches_pick_probabilities(method):
+    rng = np.random.default_rng(2)
+    batch = [tuple(rng.integers(1, 60, size=5).tolist()) for _ in range(12)] + [tuple(initial_counts()[:5])]
+    for counts, matrix in zip(batch, pick_probabilities_batch(batch, method)):
+        np.testing.assert_allclose(matrix, pick_probabilities(counts, method), atol=1e-12)
+        np.testing.assert_allclose(matrix.sum(axis=1), 1.0)
+
+
+@pytest.mark.parametrize("counts", [(5, 0, 0), (0, 3, 0, 2), (1, 0, 0, 0, 4)])
+def test_zero_ball_teams_pick_last_in_pool_order(counts):
+    matrix = pick_probabilities(counts)
+    np.testing.assert_allclose(matrix.sum(axis=1), 1.0)
+    np.testing.assert_allclose(matrix.sum(axis=0), 1.0)
+    zeros = [i for i, c in enumerate(counts) if c == 0]
+    for k, i in enumerate(zeros):
+        assert matrix[i, len(counts) - len(zeros) + k] == 1.0
+    np.testing.assert_allclose(pick_probabilities_batch([counts])[0], matrix, atol=1e-12)
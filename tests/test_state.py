@@ -0,0 +1,84 @@
+"""LotteryState against the original app's dict-based draw.
+
+The original built ``ball_owner_map`` in shuffled ball order, so a winner's
+balls moved in that order too. ``LotteryState`` hands them out in ascending
+ball order instead (the lowest numbers go to the worst-ranked recipient). That
+changes which numbers a team ends up holding, not how many, so the odds are
+the same. The owner map is pinned against a baseline that iterates balls in
+ascending order; a shuffled baseline, as the app shipped it, is checked on
+ball counts.
+"""
+import numpy as np
+
+from lottery import LotteryState, initial_counts
+
+
+def baseline_draw(owner_map, distribution, ball, final):
+    """``draw_lottery_ball`` as the app first shipped it (team names are indices).
+    Moved balls are handed out in ``owner_map``'s insertion order."""
+    winner = owner_map[ball]
+    if not final:
+        moving = [b for b, o in owner_map.items() if o == winner]
+        del distribution[winner]
+        total_remaining = sum(distribution.values())
+        proportions = {t: c / total_remaining for t, c in distribution.items()}
+        extra = {t: round(len(moving) * p) for t, p in proportions.items()}
+        diff = len(moving) - sum(extra.values())
+        if diff != 0:
+            by_prop = sorted(proportions.items(), key=lambda x: x[1], reverse=True)
+            for i in range(abs(diff)):
+                extra[by_prop[i % len(by_prop)][0]] += int(np.sign(diff))
+        pool = iter(moving)
+        for t, n in extra.items():
+            distribution[t] += n
+            for _ in range(n):
+                owner_map[next(pool)] = t
+    return winner
+
+
+def test_draws_match_ascending_baseline():
+    rng = np.random.default_rng(3)
+    for _ in range(50):
+        counts = initial_counts(consolation=int(rng.integers(6)))
+        state = LotteryState([f"team{i}" for i in range(6)], counts, rng=rng)
+        owner_map = {b: int(state.owner[b]) for b in range(1, state.total_balls + 1)}   # ascending, see above
+        distribution = dict(enumerate(counts))
+        while not state.complete:
+            ball = int(rng.integers(1, state.total_balls + 1))
+            expected = baseline_draw(owner_map, distribution, ball, len(state.draft) + 1 == len(counts))
+            assert state.draw(ball) == expected
+            if state.complete:
+                break
+            assert state.distribution() == {f"team{t}": c for t, c in distribution.items()}
+            assert state.owner[1:].tolist() == [owner_map[b] for b in range(1, state.total_balls + 1)]
+            for t in state.remaining():
+                assert state.balls_of(t) == [b for b in range(1, state.total_balls + 1) if state.owner[b] == t]
+                assert len(state.balls_of(t)) == state.counts[t]
+
+
+def test_counts_match_shuffled_baseline():
+    rng = np.random.default_rng(4)
+    for _ in range(50):
+        counts = initial_counts(consolation=int(rng.integers(6)))
+        state = LotteryState([f"team{i}" for i in range(6)], counts, rng=rng)
+        balls = rng.permutation(np.arange(1, state.total_balls + 1))
+        owner_map = {int(b): int(state.owner[b]) for b in balls}   # shuffled insertion, as the app did
+        distribution = dict(enumerate(counts))
+        while not state.complete:
+            team = int(rng.choice(state.remaining()))
+            ball = next(b for b, o in owner_map.items() if o == team)
+            final = len(state.draft) + 1 == len(counts)
+            assert baseline_draw(owner_map, distribution, ball, final) == team
+            assert state.draw(state.balls_of(team)[0]) == team
+            if not state.complete:
+                assert state.distribution() == {f"team{t}": c for t, c in distribution.items()}
+                assert [sum(o == t for o in owner_map.values()) for t in state.remaining()] == \
+                    [len(state.balls_of(t)) for t in state.remaining()]
+
+
+def test_snapshot_round_trip_keeps_fingerprint():
+    state = LotteryState(["a", "b", "c", "d"], [50, 30, 15, 5], seed=7)
+    state.draw(1)
+    restored = LotteryState.from_snapshot(state.snapshot())
+    assert restored.fingerprint() == state.fingerprint()
+    assert restored.draft == state.draft and (restored.owner == state.owner).all()